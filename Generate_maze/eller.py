@@ -0,0 +1,166 @@
+# Generate_maze/eller.py
+#
+# Streaming maze generation with Eller's algorithm, for mazes that don't fit
+# in memory. Only the current row of set labels is kept, every text row is
+# written out as soon as it's done, and A, B and the special tiles are picked
+# with reservoir sampling and patched into the file afterwards, so memory is
+# O(cols + number of special tiles) whatever the height.
+#
+#   python Generate_maze/eller.py huge.txt 100001 100001 --seed 1
+import argparse
+import math
+import random
+
+WALL = ord("#")
+OPEN = ord(" ")
+
+
+class _Reservoir:
+    # Algorithm L: jumps straight to the next item that gets kept instead
+    # of drawing a random number for every open cell
+    def __init__(self, k, rng):
+        self.k = k
+        self.rng = rng
+        self.items = []
+        self.seen = 0
+        self.next = 0 if k else math.inf
+        self.w = 1.0
+
+    def _uniform(self):
+        # Open interval (0, 1), logs below can't take 0 or 1
+        u = self.rng.random()
+        while u == 0.0:
+            u = self.rng.random()
+        return u
+
+    def _skip(self):
+        self.w *= math.exp(math.log(self._uniform()) / self.k)
+        self.next += int(math.log(self._uniform()) / math.log1p(-self.w)) + 1
+
+    def offer(self, row, cols):
+        # cols: open columns of this text row, in order
+        end = self.seen + len(cols)
+        while self.next < end:
+            item = (row, cols[self.next - self.seen])
+            if len(self.items) < self.k:
+                self.items.append(item)
+                if len(self.items) < self.k:
+                    self.next += 1
+                else:
+                    self._skip()
+            else:
+                self.items[self.rng.randrange(self.k)] = item
+                self._skip()
+        self.seen = end
+
+
+def _find(parent, label):
+    while parent[label] != label:
+        parent[label] = parent[parent[label]]
+        label = parent[label]
+    return label
+
+
+def stream_maze(path, rows, cols, num_penalty=3, num_boost=3, num_teleport=2, seed=None):
+    """Write a perfect rows x cols maze to path, one row at a time.
+
+    Same layout and text format as mazeGen.generate_maze()/save_maze(), so
+    maze.Maze and ArrayMaze load the result directly.
+    """
+    cell_rows, cell_cols = rows // 2, cols // 2
+    if cell_rows < 1 or cell_cols < 1:
+        raise ValueError("Maze needs at least 3 rows and 3 columns")
+
+    symbols = [b"A", b"B"] + [b"P"] * num_penalty + [b"N"] * num_boost + [b"T"] * num_teleport
+    # A perfect maze has every cell open plus one passage per tree edge
+    open_count = 2 * cell_rows * cell_cols - 1
+    if len(symbols) > open_count:
+        raise ValueError(f"Can't place {len(symbols)} tiles on {open_count} open cells")
+
+    rng = random.Random(seed)
+    random_ = rng.random
+    reservoir = _Reservoir(len(symbols), rng)
+    last_col = 2 * cell_cols
+    wall_row = bytes([WALL]) * cols + b"\n"
+
+    # Set labels stay in 0..cell_cols-1: a row never has more sets than cells
+    labels = list(range(cell_cols))
+
+    with open(path, "wb+") as f:
+        f.write(wall_row)
+        for i in range(cell_rows):
+            last = i == cell_rows - 1
+            r = 2 * i + 1
+
+            # Join neighbors in different sets, at random (always on the last row)
+            parent = list(range(cell_cols))
+            line = bytearray(wall_row)
+            line[1:last_col:2] = bytes([OPEN]) * cell_cols
+            for j in range(cell_cols - 1):
+                a = _find(parent, labels[j])
+                b = _find(parent, labels[j + 1])
+                if a != b and (last or random_() < 0.5):
+                    parent[b] = a
+                    line[2 * j + 2] = OPEN
+            labels = [_find(parent, label) for label in labels]
+
+            f.write(line)
+            reservoir.offer(r, [c for c in range(1, last_col) if line[c] == OPEN])
+            if last:
+                break
+
+            # Every set carries on down at least once
+            below = bytearray(wall_row)
+            down = [False] * cell_cols
+            members = {}
+            carried = set()
+            for j, label in enumerate(labels):
+                members.setdefault(label, []).append(j)
+                if random_() < 0.5:
+                    down[j] = True
+                    carried.add(label)
+            for label, cells in members.items():
+                if label not in carried:
+                    down[cells[int(random_() * len(cells))]] = True
+
+            # Cells that didn't come from above start new sets with free labels
+            free = [label for label in range(cell_cols) if label not in members]
+            next_labels = []
+            for j in range(cell_cols):
+                if down[j]:
+                    below[2 * j + 1] = OPEN
+                    next_labels.append(labels[j])
+                else:
+                    next_labels.append(free.pop())
+            labels = next_labels
+
+            f.write(below)
+            reservoir.offer(r + 1, [2 * j + 1 for j in range(cell_cols) if down[j]])
+
+        # Rows past the last cell row (even heights) stay solid wall
+        for _ in range(rows - 2 * cell_rows):
+            f.write(wall_row)
+
+        # Patch the sampled cells in place, every row is cols + 1 bytes
+        cells = reservoir.items
+        rng.shuffle(cells)
+        for (r, c), symbol in zip(cells, symbols):
+            f.seek(r * (cols + 1) + c)
+            f.write(symbol)
+    return path
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Stream a large maze to a text file.")
+    parser.add_argument("path")
+    parser.add_argument("rows", type=int)
+    parser.add_argument("cols", type=int)
+    parser.add_argument("--penalty", type=int, default=3)
+    parser.add_argument("--boost", type=int, default=3)
+    parser.add_argument("--teleport", type=int, default=2)
+    parser.add_argument("--seed", type=int)
+    args = parser.parse_args()
+    stream_maze(
+        args.path, args.rows, args.cols,
+        args.penalty, args.boost, args.teleport, args.seed,
+    )
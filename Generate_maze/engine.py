@@ -0,0 +1,256 @@
+# Generate_maze/engine.py
+#
+# Seeded maze generation that scales to ~10^7 cells. Mazes are built on a
+# grid of logical cells at odd (row, col) positions, the carved passages are
+# collected in two boolean arrays and the text grid is assembled with numpy.
+import random
+
+import numpy as np
+
+WALL = ord("#")
+OPEN = ord(" ")
+
+
+def _cell_shape(rows, cols):
+    # Logical cells sit at odd indices, same layout as mazeGen.generate_maze
+    return rows // 2, cols // 2
+
+
+class _Passages:
+    # right[i, j]: (i, j) <-> (i, j + 1) is open, down[i, j]: (i, j) <-> (i + 1, j)
+    def __init__(self, cell_rows, cell_cols):
+        self.cell_rows = cell_rows
+        self.cell_cols = cell_cols
+        self.right = np.zeros((cell_rows, max(cell_cols - 1, 0)), dtype=bool)
+        self.down = np.zeros((max(cell_rows - 1, 0), cell_cols), dtype=bool)
+        # Carvers append each opened pair of flat cell ids here and finish()
+        # writes them all into the arrays in one go
+        self.opened = []
+
+    def open_between(self, a, b):
+        self.opened.append(a)
+        self.opened.append(b)
+
+    def finish(self):
+        pairs = np.array(self.opened, dtype=np.int64).reshape(-1, 2)
+        low, high = pairs.min(axis=1), pairs.max(axis=1)
+        horizontal = high == low + 1
+        rows, cols = np.divmod(low[horizontal], self.cell_cols)
+        self.right[rows, cols] = True
+        rows, cols = np.divmod(low[~horizontal], self.cell_cols)
+        self.down[rows, cols] = True
+        self.opened = []
+        return self
+
+
+def _neighbors(cell, cell_rows, cell_cols):
+    row, col = divmod(cell, cell_cols)
+    result = []
+    if row > 0:
+        result.append(cell - cell_cols)
+    if row < cell_rows - 1:
+        result.append(cell + cell_cols)
+    if col > 0:
+        result.append(cell - 1)
+    if col < cell_cols - 1:
+        result.append(cell + 1)
+    return result
+
+
+def backtracker(cell_rows, cell_cols, rng):
+    # Recursive backtracker with an explicit stack
+    passages = _Passages(cell_rows, cell_cols)
+    count = cell_rows * cell_cols
+    visited = bytearray(count)
+    start = int(rng.random() * count)
+    visited[start] = 1
+    stack = [start]
+    random_ = rng.random
+    opened = passages.opened
+    while stack:
+        cell = stack[-1]
+        row, col = divmod(cell, cell_cols)
+        options = []
+        if row > 0 and not visited[cell - cell_cols]:
+            options.append(cell - cell_cols)
+        if row < cell_rows - 1 and not visited[cell + cell_cols]:
+            options.append(cell + cell_cols)
+        if col > 0 and not visited[cell - 1]:
+            options.append(cell - 1)
+        if col < cell_cols - 1 and not visited[cell + 1]:
+            options.append(cell + 1)
+        if not options:
+            stack.pop()
+            continue
+        nxt = options[int(random_() * len(options))]
+        opened.append(cell)
+        opened.append(nxt)
+        visited[nxt] = 1
+        stack.append(nxt)
+    return passages.finish()
+
+
+def kruskal(cell_rows, cell_cols, rng):
+    # Randomized Kruskal: shuffle every inner wall, knock it down when it
+    # joins two different sets (union-find with path halving)
+    passages = _Passages(cell_rows, cell_cols)
+    count = cell_rows * cell_cols
+
+    # Walls as (a, b) cell pairs, right walls first, then down walls
+    cells = np.arange(count, dtype=np.int64).reshape(cell_rows, cell_cols)
+    first = np.concatenate([cells[:, :-1].reshape(-1), cells[:-1, :].reshape(-1)])
+    second = np.concatenate([cells[:, 1:].reshape(-1), cells[1:, :].reshape(-1)])
+    order = np.random.default_rng(rng.getrandbits(64)).permutation(first.size)
+    first = first[order].tolist()
+    second = second[order].tolist()
+
+    parent = list(range(count))
+    opened = passages.opened
+    remaining = count - 1
+    for i in range(len(first)):
+        a = first[i]
+        while parent[a] != a:
+            parent[a] = parent[parent[a]]
+            a = parent[a]
+        b = second[i]
+        while parent[b] != b:
+            parent[b] = parent[parent[b]]
+            b = parent[b]
+        if a != b:
+            parent[a] = b
+            opened.append(first[i])
+            opened.append(second[i])
+            remaining -= 1
+            if not remaining:
+                break
+    return passages.finish()
+
+
+def prim(cell_rows, cell_cols, rng):
+    # Randomized Prim: grow from one cell, attaching a random frontier cell
+    # to a random in-maze neighbor each time
+    passages = _Passages(cell_rows, cell_cols)
+    count = cell_rows * cell_cols
+    in_maze = bytearray(count)
+    queued = bytearray(count)
+    random_ = rng.random
+
+    start = int(random_() * count)
+    in_maze[start] = 1
+    frontier = []
+    for cell in _neighbors(start, cell_rows, cell_cols):
+        queued[cell] = 1
+        frontier.append(cell)
+
+    while frontier:
+        # Swap-pop a random frontier cell
+        i = int(random_() * len(frontier))
+        frontier[i], frontier[-1] = frontier[-1], frontier[i]
+        cell = frontier.pop()
+
+        links = []
+        for other in _neighbors(cell, cell_rows, cell_cols):
+            if in_maze[other]:
+                links.append(other)
+            elif not queued[other]:
+                queued[other] = 1
+                frontier.append(other)
+        passages.open_between(cell, links[int(random_() * len(links))])
+        in_maze[cell] = 1
+    return passages.finish()
+
+
+def wilson(cell_rows, cell_cols, rng):
+    # Wilson's algorithm: loop-erased random walks give a uniform spanning tree.
+    # Overwriting the exit direction on revisits erases the loops for free.
+    passages = _Passages(cell_rows, cell_cols)
+    count = cell_rows * cell_cols
+    in_tree = bytearray(count)
+    exit_to = [0] * count
+    random_ = rng.random
+
+    order = list(range(count))
+    rng.shuffle(order)
+    in_tree[order[0]] = 1
+
+    for start in order[1:]:
+        cell = start
+        while not in_tree[cell]:
+            options = _neighbors(cell, cell_rows, cell_cols)
+            nxt = options[int(random_() * len(options))]
+            exit_to[cell] = nxt
+            cell = nxt
+        cell = start
+        while not in_tree[cell]:
+            in_tree[cell] = 1
+            passages.open_between(cell, exit_to[cell])
+            cell = exit_to[cell]
+    return passages.finish()
+
+
+ALGORITHMS = {
+    "backtracker": backtracker,
+    "kruskal": kruskal,
+    "prim": prim,
+    "wilson": wilson,
+}
+
+
+def carve(rows, cols, algorithm="backtracker", seed=None):
+    """Carve a perfect maze, returned as a (rows, cols) uint8 array of ASCII."""
+    if algorithm not in ALGORITHMS:
+        raise ValueError(f"Unknown maze algorithm: {algorithm}")
+    cell_rows, cell_cols = _cell_shape(rows, cols)
+    if cell_rows < 1 or cell_cols < 1:
+        raise ValueError("Maze needs at least 3 rows and 3 columns")
+
+    rng = random.Random(seed)
+    passages = ALGORITHMS[algorithm](cell_rows, cell_cols, rng)
+
+    grid = np.full((rows, cols), WALL, dtype=np.uint8)
+    last_row, last_col = 2 * cell_rows, 2 * cell_cols
+    grid[1:last_row:2, 1:last_col:2] = OPEN
+    grid[1:last_row:2, 2:last_col - 1:2][passages.right] = OPEN
+    grid[2:last_row - 1:2, 1:last_col:2][passages.down] = OPEN
+    return grid
+
+
+def place_tiles(grid, counts, seed=None):
+    """Put each (symbol, count) on distinct open cells, in a single draw."""
+    open_cells = np.flatnonzero(grid.reshape(-1) == OPEN)
+    total = sum(count for _, count in counts)
+    if total > open_cells.size:
+        raise ValueError(f"Can't place {total} tiles on {open_cells.size} open cells")
+
+    rng = np.random.default_rng(seed)
+    chosen = open_cells[rng.choice(open_cells.size, size=total, replace=False)]
+    flat = grid.reshape(-1)
+    position = 0
+    for symbol, count in counts:
+        flat[chosen[position:position + count]] = ord(symbol)
+        position += count
+    return grid
+
+
+def generate(rows=15, cols=30, num_penalty=3, num_boost=3, num_teleport=2,
+             algorithm="backtracker", seed=None):
+    """Seeded maze with start, goal and special tiles, as a uint8 ASCII array."""
+    grid = carve(rows, cols, algorithm, seed)
+    # Derive the placement seed from the carving seed so one seed fixes both
+    placement_seed = None if seed is None else [seed, 1]
+    return place_tiles(
+        grid,
+        [("A", 1), ("B", 1), ("P", num_penalty), ("N", num_boost), ("T", num_teleport)],
+        placement_seed,
+    )
+
+
+def to_lines(grid):
+    return [row.tobytes().decode("ascii") for row in grid]
+
+
+def save(grid, path):
+    with open(path, "wb") as f:
+        for row in grid:
+            f.write(row.tobytes())
+            f.write(b"\n")
@@ -0,0 +1,75 @@
+# adjacency.py
+from array import array
+
+# Action codes stored alongside every edge
+ACTIONS = ("up", "down", "left", "right", "teleport")
+UP, DOWN, LEFT, RIGHT, TELEPORT = range(len(ACTIONS))
+
+
+class Adjacency:
+    """CSR neighbor table over flat cell indices.
+
+    The neighbors of cell v are targets[offsets[v]:offsets[v + 1]], with the
+    matching action codes in actions. Teleport edges are folded in, so a
+    solver can walk the table with plain ints and never build a tuple. Walls
+    have no edges at all.
+    """
+
+    def __init__(self, width, offsets, targets, actions, teleports):
+        self.width = width
+        self.offsets = offsets
+        self.targets = targets
+        self.actions = actions
+        # Flat index -> flat index of the paired pad
+        self.teleports = teleports
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def degree(self, index):
+        return self.offsets[index + 1] - self.offsets[index]
+
+    def edges(self, index):
+        for k in range(self.offsets[index], self.offsets[index + 1]):
+            yield self.actions[k], self.targets[k]
+
+
+def build_adjacency(maze):
+    height, width = maze.height, maze.width
+    walls = maze.walls
+
+    teleports = {maze.index(a): maze.index(b) for a, b in maze.teleports.items()}
+
+    offsets = array("i", [0])
+    targets = array("i")
+    actions = array("b")
+
+    for r in range(height):
+        row = walls[r]
+        above = walls[r - 1] if r > 0 else None
+        below = walls[r + 1] if r + 1 < height else None
+        base = r * width
+        for c in range(width):
+            if row[c]:
+                # Walls get no edges, a search can't start or pass there
+                offsets.append(len(targets))
+                continue
+            if above is not None and not above[c]:
+                targets.append(base - width + c)
+                actions.append(UP)
+            if below is not None and not below[c]:
+                targets.append(base + width + c)
+                actions.append(DOWN)
+            if c > 0 and not row[c - 1]:
+                targets.append(base + c - 1)
+                actions.append(LEFT)
+            if c + 1 < width and not row[c + 1]:
+                targets.append(base + c + 1)
+                actions.append(RIGHT)
+            partner = teleports.get(base + c)
+            if partner is not None:
+                targets.append(partner)
+                actions.append(TELEPORT)
+            offsets.append(len(targets))
+
+    return Adjacency(width, offsets, targets, actions, teleports)
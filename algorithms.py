@@ -1,7 +1,11 @@
 # algorithms.py
 import time
 from collections import deque
-from core import Node
+from adjacency import ACTIONS, UP, DOWN, LEFT, RIGHT
+from core import (
+    Node, SearchState, StackFrontier, QueueFrontier, PriorityFrontier, BucketFrontier,
+    TILE_CHARS, TILE_OPEN, TILE_START, TILE_GOAL, TILE_WALL, TILE_ENCOURAGE, TILE_PENALTY
+)
 
 import time
 from collections import deque
@@ -15,6 +19,8 @@ DIR_DELTA = {
     "LEFT": (0, -1)
 }
 
+DIR_ACTIONS = {"UP": UP, "RIGHT": RIGHT, "DOWN": DOWN, "LEFT": LEFT}
+
 def turn_left(direction):
     return DIRECTIONS[(DIRECTIONS.index(direction) - 1) % 4]
 
@@ -26,114 +32,150 @@ def move(pos, direction):
     return (pos[0] + dx, pos[1] + dy)
 
 
-def dfs(maze):
-    start = Node(state=maze.start, parent=None, action=None)
-    frontier = [start]
-    explored = set()
-    goal = maze.goal
+def dfs(maze, events=True):
+    adjacency = maze.adjacency()
+    offsets, targets, codes = adjacency.offsets, adjacency.targets, adjacency.actions
+    width = maze.width
+
+    start = Node(state=maze.index(maze.start), parent=None, action=None)
+    frontier = StackFrontier()
+    frontier.add(start)
+    search = SearchState(width, frontier)
+    expanded = search.expanded
+    goal = maze.index(maze.goal)
     steps = 0
     start_time = time.perf_counter()
 
-    while frontier:
-        node = frontier.pop()
+    while not frontier.empty():
+        node = frontier.remove()
         steps += 1
 
         if node.state == goal:
-            actions, cells = _reconstruct_path(node, explored)
+            actions, cells = _reconstruct_path(node, width)
             duration = time.perf_counter() - start_time
             yield {
                 "status": "done",
                 "path": cells,
-                "explored": explored,
+                "explored": search.explored_cells(),
+                "search": search,
                 "steps": steps,
                 "duration": duration
             }
             return
 
-        if node.state not in explored:
-            explored.add(node.state)
-            yield {
-                "status": "exploring",
-                "current": node.state,
-                "path": None,
-                "explored": set(explored),
-                "steps": steps,
-                "duration": time.perf_counter() - start_time
-            }
-
-            for action, state in maze.neighbors(node.state):
-                if state not in explored and not any(n.state == state for n in frontier):
-                    frontier.append(Node(state=state, parent=node, action=action))
+        if node.state not in expanded:
+            expanded.add(node.state)
+            added = []
+
+            for k in range(offsets[node.state], offsets[node.state + 1]):
+                state = targets[k]
+                if state not in expanded and not frontier.contains_state(state):
+                    frontier.add(Node(state=state, parent=node, action=codes[k]))
+                    if events:
+                        added.append(divmod(state, width))
+
+            if events:
+                current = divmod(node.state, width)
+                yield {
+                    "status": "exploring",
+                    "current": current,
+                    "expanded": [current],
+                    "frontier_added": added,
+                    "search": search,
+                    "path": None,
+                    "steps": steps,
+                    "duration": time.perf_counter() - start_time
+                }
 
     yield {
         "status": "failed",
         "path": None,
-        "explored": explored,
+        "explored": search.explored_cells(),
+        "search": search,
         "steps": steps,
         "duration": time.perf_counter() - start_time
     }
 
 
-def bfs(maze):
-    start = Node(state=maze.start, parent=None, action=None)
-    frontier = deque([start])
-    explored = set()
+def bfs(maze, events=True):
+    adjacency = maze.adjacency()
+    offsets, targets, codes = adjacency.offsets, adjacency.targets, adjacency.actions
+    tiles = maze.tile_codes()
+    width = maze.width
+
+    start = Node(state=maze.index(maze.start), parent=None, action=None)
+    frontier = QueueFrontier()
+    frontier.add(start)
+    search = SearchState(width, frontier)
+    expanded = search.expanded
+    goal = maze.index(maze.goal)
     steps = 0
     start_time = time.perf_counter()
 
-    while frontier:
-        node = frontier.popleft()
+    while not frontier.empty():
+        node = frontier.remove()
         steps += 1
 
-        if node.state == maze.goal:
-            actions, cells = _reconstruct_path(node, explored)
+        if node.state == goal:
+            actions, cells = _reconstruct_path(node, width)
             duration = time.perf_counter() - start_time
             yield {
                 "status": "done",
                 "path": cells,
-                "explored": explored,
+                "explored": search.explored_cells(),
+                "search": search,
                 "steps": steps,
                 "duration": duration
             }
             return
 
-        if node.state not in explored:
-            explored.add(node.state)
-            yield {
-                "status": "exploring",
-                "current": node.state,
-                "path": None,
-                "explored": set(explored),
-                "steps": steps,
-                "duration": time.perf_counter() - start_time
-            }
+        if node.state not in expanded:
+            expanded.add(node.state)
+            added = []
 
-            for action, state in maze.neighbors(node.state):
-                if state in explored or any(n.state == state for n in frontier):
+            for k in range(offsets[node.state], offsets[node.state + 1]):
+                state = targets[k]
+                if state in expanded or frontier.contains_state(state):
                     continue
 
-                child = Node(state=state, parent=node, action=action)
+                child = Node(state=state, parent=node, action=codes[k])
+                if events:
+                    added.append(divmod(state, width))
 
                 # 🌿 Encourage (N): higher priority (insert to front)
-                if state in maze.encouragements:
-                    frontier.appendleft(child)
+                if tiles[state] == TILE_ENCOURAGE:
+                    frontier.add_front(child)
 
                 # 🧱 Penalty (P): regular priority
-                elif state in maze.penalties:
-                    frontier.append(child)
+                elif tiles[state] == TILE_PENALTY:
+                    frontier.add(child)
 
                 # 🌀 Teleport (T): slightly prioritize
-                elif state in maze.teleports:
-                    frontier.appendleft(child)
+                elif state in adjacency.teleports:
+                    frontier.add_front(child)
 
                 # Normal cell
                 else:
-                    frontier.append(child)
+                    frontier.add(child)
+
+            if events:
+                current = divmod(node.state, width)
+                yield {
+                    "status": "exploring",
+                    "current": current,
+                    "expanded": [current],
+                    "frontier_added": added,
+                    "search": search,
+                    "path": None,
+                    "steps": steps,
+                    "duration": time.perf_counter() - start_time
+                }
 
     yield {
         "status": "failed",
         "path": None,
-        "explored": explored,
+        "explored": search.explored_cells(),
+        "search": search,
         "steps": steps,
         "duration": time.perf_counter() - start_time
     }
@@ -147,65 +189,109 @@ def heuristic(a, b):
     # Manhattan distance
     return abs(a[0] - b[0]) + abs(a[1] - b[1])
 
-def astar(maze):
-    counter = count()  
-    start_node = Node(state=maze.start, parent=None, action=None)
-    frontier = []
-    heapq.heappush(frontier, (0, next(counter), start_node))
-    explored = set()
-    cost_so_far = {maze.start: 0}
+# Step costs used by astar, indexed by tile code
+ASTAR_COSTS = [1] * len(TILE_CHARS)
+ASTAR_COSTS[TILE_ENCOURAGE] = 0.5  # reward zone
+ASTAR_COSTS[TILE_PENALTY] = 2      # penalty zone
+
+# Priority queues dijkstra and astar can run on, picked per run with queue=
+PRIORITY_QUEUES = ("heap", "bucket")
+
+
+def _priority_frontier(queue, scale):
+    # The bucket queue needs every priority * scale to be a whole number
+    if queue == "heap":
+        return PriorityFrontier()
+    if queue == "bucket":
+        return BucketFrontier(scale)
+    raise Exception(f"Unknown priority queue: {queue}")
+
+
+def astar(maze, events=True, queue="heap", bound="manhattan"):
+    # bound="alt" uses the maze's cached landmark bounds, which see
+    # teleports and never overestimate, instead of Manhattan distance
+    adjacency = maze.adjacency()
+    offsets, targets, codes = adjacency.offsets, adjacency.targets, adjacency.actions
+    tiles = maze.tile_codes()
+    width = maze.width
+    goal = maze.index(maze.goal)
+    goal_row, goal_col = maze.goal
+    if bound == "alt":
+        bounds = maze.landmarks().heuristic(goal)
+    elif bound == "manhattan":
+        bounds = None
+    else:
+        raise Exception(f"Unknown bound: {bound}")
+
+    start = maze.index(maze.start)
+    start_node = Node(state=start, parent=None, action=None)
+    # Costs are multiples of 0.5 and the heuristic is whole
+    frontier = _priority_frontier(queue, 2)
+    frontier.add(start_node, 0)
+    search = SearchState(width, frontier)
+    expanded = search.expanded
+    cost_so_far = {start: 0}
     steps = 0
     start_time = time.perf_counter()
 
-    while frontier:
-        _, _, current = heapq.heappop(frontier)
+    while not frontier.empty():
+        current = frontier.remove()
         steps += 1
 
-        if current.state == maze.goal:
-            actions, cells = _reconstruct_path(current, explored)
+        if current.state == goal:
+            actions, cells = _reconstruct_path(current, width)
             yield {
                 "status": "done",
                 "path": cells,
-                "explored": explored,
+                "explored": search.explored_cells(),
+                "search": search,
                 "steps": steps,
                 "duration": time.perf_counter() - start_time
             }
             return
 
-        if current.state not in explored:
-            explored.add(current.state)
-            yield {
-                "status": "exploring",
-                "current": current.state,
-                "path": None,
-                "explored": set(explored),
-                "steps": steps,
-                "duration": time.perf_counter() - start_time
-            }
-
-            for action, neighbor in maze.neighbors(current.state):
-                if neighbor in maze.teleports:
-                    destination = maze.teleports[neighbor]
-                    neighbor = destination  # update target
-
-                if neighbor in maze.encouragements:
-                    cell_cost = 0.5  # reward zone
-                elif neighbor in maze.penalties:
-                    cell_cost = 2    # penalty zone
-                else:
-                    cell_cost = 1    # normal
+        if current.state not in expanded:
+            expanded.add(current.state)
+            added = []
 
-                new_cost = cost_so_far[current.state] + cell_cost
+            # Pads are cells like any other: entering one costs its tile,
+            # and the teleport edge to its partner is a separate step
+            base_cost = cost_so_far[current.state]
+            for k in range(offsets[current.state], offsets[current.state + 1]):
+                neighbor = targets[k]
+                new_cost = base_cost + ASTAR_COSTS[tiles[neighbor]]
 
                 if neighbor not in cost_so_far or new_cost < cost_so_far[neighbor]:
+                    if bounds is None:
+                        row, col = divmod(neighbor, width)
+                        priority = new_cost + abs(row - goal_row) + abs(col - goal_col)
+                    elif bounds[neighbor] == float("inf"):
+                        continue  # Can't reach the goal from there
+                    else:
+                        priority = new_cost + bounds[neighbor]
                     cost_so_far[neighbor] = new_cost
-                    priority = new_cost + heuristic(neighbor, maze.goal)
-                    heapq.heappush(frontier, (priority, next(counter), Node(state=neighbor, parent=current, action=action)))
+                    frontier.add(Node(state=neighbor, parent=current, action=codes[k]), priority)
+                    if events:
+                        added.append(divmod(neighbor, width))
+
+            if events:
+                cell = divmod(current.state, width)
+                yield {
+                    "status": "exploring",
+                    "current": cell,
+                    "expanded": [cell],
+                    "frontier_added": added,
+                    "search": search,
+                    "path": None,
+                    "steps": steps,
+                    "duration": time.perf_counter() - start_time
+                }
     
     yield {
         "status": "failed",
         "path": None,
-        "explored": explored,
+        "explored": search.explored_cells(),
+        "search": search,
         "steps": steps,
         "duration": time.perf_counter() - start_time
     }
@@ -215,64 +301,86 @@ from itertools import count
 from core import Node
 import time
 
-def dijkstra(maze):
-    start_node = Node(state=maze.start, parent=None, action=None)
-    frontier = []
-    counter = count()
-    heapq.heappush(frontier, (0, next(counter), start_node))
-    explored = set()
-    cost_so_far = {maze.start: 0}
+def alt_astar(maze, events=True, queue="heap"):
+    # astar guided by landmark (ALT) bounds
+    yield from astar(maze, events, queue, bound="alt")
+
+
+def dijkstra(maze, events=True, queue="heap"):
+    adjacency = maze.adjacency()
+    offsets, targets, codes = adjacency.offsets, adjacency.targets, adjacency.actions
+    width = maze.width
+    goal = maze.index(maze.goal)
+
+    start = maze.index(maze.start)
+    start_node = Node(state=start, parent=None, action=None)
+    frontier = _priority_frontier(queue, 1)
+    frontier.add(start_node, 0)
+    search = SearchState(width, frontier)
+    expanded = search.expanded
+    cost_so_far = {start: 0}
     steps = 0
     start_time = time.perf_counter()
 
-    while frontier:
-        cost, _, current = heapq.heappop(frontier)
+    while not frontier.empty():
+        current = frontier.remove()
         steps += 1
 
-        if current.state == maze.goal:
-            actions, cells = _reconstruct_path(current, explored)
+        if current.state == goal:
+            actions, cells = _reconstruct_path(current, width)
             yield {
                 "status": "done",
                 "path": cells,
-                "explored": explored,
+                "explored": search.explored_cells(),
+                "search": search,
                 "steps": steps,
                 "duration": time.perf_counter() - start_time
             }
             return
 
-        if current.state not in explored:
-            explored.add(current.state)
-            yield {
-                "status": "exploring",
-                "current": current.state,
-                "path": None,
-                "explored": set(explored),
-                "steps": steps,
-                "duration": time.perf_counter() - start_time
-            }
+        if current.state not in expanded:
+            expanded.add(current.state)
+            added = []
 
-            for action, neighbor in maze.neighbors(current.state):
-                new_cost = cost_so_far[current.state] + 1  # Uniform cost
+            new_cost = cost_so_far[current.state] + 1  # Uniform cost
+            for k in range(offsets[current.state], offsets[current.state + 1]):
+                neighbor = targets[k]
                 if neighbor not in cost_so_far or new_cost < cost_so_far[neighbor]:
                     cost_so_far[neighbor] = new_cost
-                    heapq.heappush(frontier, (new_cost, next(counter), Node(state=neighbor, parent=current, action=action)))
+                    frontier.add(Node(state=neighbor, parent=current, action=codes[k]), new_cost)
+                    if events:
+                        added.append(divmod(neighbor, width))
+
+            if events:
+                cell = divmod(current.state, width)
+                yield {
+                    "status": "exploring",
+                    "current": cell,
+                    "expanded": [cell],
+                    "frontier_added": added,
+                    "search": search,
+                    "path": None,
+                    "steps": steps,
+                    "duration": time.perf_counter() - start_time
+                }
 
     yield {
         "status": "failed",
         "path": None,
-        "explored": explored,
+        "explored": search.explored_cells(),
+        "search": search,
         "steps": steps,
         "duration": time.perf_counter() - start_time
     }
 
-def wall_follower(maze, follow_left=True):
-    visited = set()
+def wall_follower(maze, follow_left=True, events=True):
     current = maze.start
     facing = "RIGHT"
-    explored = set()
+    search = SearchState(maze.width)
+    visited = search.expanded
     steps = 0
     start_time = time.perf_counter()
-    node = Node(state=current, parent=None, action=None)
+    node = Node(state=maze.index(current), parent=None, action=None)
 
     def get_directions(facing):
         if follow_left:
@@ -282,25 +390,27 @@ def wall_follower(maze, follow_left=True):
 
     while current != maze.goal:
         steps += 1
-        explored.add(current)
-        visited.add(current)
+        visited.add(node.state)
 
-        yield {
-            "status": "exploring",
-            "current": current,
-            "path": None,
-            "explored": set(explored),
-            "steps": steps,
-            "duration": time.perf_counter() - start_time
-        }
+        if events:
+            yield {
+                "status": "exploring",
+                "current": current,
+                "expanded": [current],
+                "frontier_added": [],
+                "search": search,
+                "path": None,
+                "steps": steps,
+                "duration": time.perf_counter() - start_time
+            }
 
         moved = False
         for dir_try in get_directions(facing):
             next_pos = move(current, dir_try)
-            if maze.is_valid(next_pos) and next_pos not in visited:
+            if maze.is_valid(next_pos) and maze.index(next_pos) not in visited:
                 facing = dir_try
                 current = next_pos
-                node = Node(state=current, parent=node, action=dir_try)
+                node = Node(state=maze.index(current), parent=node, action=DIR_ACTIONS[dir_try])
                 moved = True
                 break
 
@@ -308,98 +418,531 @@ def wall_follower(maze, follow_left=True):
             yield {
                 "status": "failed",
                 "path": None,
-                "explored": explored,
+                "explored": search.explored_cells(),
+                "search": search,
                 "steps": steps,
                 "duration": time.perf_counter() - start_time
             }
             return
 
     # Reached goal
-    actions, cells = _reconstruct_path(node, explored)
+    actions, cells = _reconstruct_path(node, maze.width)
     yield {
         "status": "done",
         "path": cells,
-        "explored": explored,
+        "explored": search.explored_cells(),
+        "search": search,
         "steps": steps,
         "duration": time.perf_counter() - start_time
     }
 
-def lhr(maze):
-    return wall_follower(maze, follow_left=True)
+def lhr(maze, events=True):
+    return wall_follower(maze, follow_left=True, events=events)
 
-def rhr(maze):
-    return wall_follower(maze, follow_left=False)
+def rhr(maze, events=True):
+    return wall_follower(maze, follow_left=False, events=events)
 
-def deadendfill(maze):
-    from collections import deque
+def deadendfill(maze, events=True):
+    # Fill dead ends down to the corridor(s) joining start and goal, then
+    # walk what's left; the fill is cached, dead_ends.reduce_maze reuses it
+    from dead_ends import dead_ends, corridor_path
     import time
 
     start_time = time.perf_counter()
+    search = SearchState(maze.width)
+    result = dead_ends(maze)
+    order = result.order.tolist()
+
+    if events:
+        expanded = search.expanded
+        for steps, index in enumerate(order, 1):
+            expanded.add(index)
+            cell = divmod(index, maze.width)
+            yield {
+                "status": "exploring",
+                "current": cell,
+                "expanded": [cell],
+                "frontier_added": [],
+                "search": search,
+                "path": None,
+                "steps": steps,
+                "duration": time.perf_counter() - start_time
+            }
+    else:
+        search.expanded.update(order)
+
+    path = corridor_path(maze, result)
+    yield {
+        "status": "done" if path is not None else "failed",
+        "path": path,
+        "explored": search.explored_cells(),
+        "search": search,
+        "steps": len(order),
+        "duration": time.perf_counter() - start_time
+    }
+
+
+def bidirectional_bfs(maze, events=True):
+    # Layer-synchronous BFS from both ends; the smaller frontier grows next
+    adjacency = maze.adjacency()
+    offsets, targets = adjacency.offsets, adjacency.targets
+    width = maze.width
+    start = maze.index(maze.start)
+    goal = maze.index(maze.goal)
+
+    search = SearchState(width)
+    expanded = search.expanded
+    parents = ({start: -1}, {goal: -1})
+    depths = ({start: 0}, {goal: 0})
+    layers = ([start], [goal])
     steps = 0
-    explored = set()
-
-    # Convert the maze grid into a mutable version
-    grid = [list(row) for row in maze.grid]
-
-    def count_open_neighbors(i, j):
-        count = 0
-        for di, dj in [(-1,0),(1,0),(0,-1),(0,1)]:
-            ni, nj = i + di, j + dj
-            if 0 <= ni < maze.height and 0 <= nj < maze.width:
-                if grid[ni][nj] in (" ", "A", "B"):
-                    count += 1
-        return count
-
-    queue = deque()
-    for i in range(maze.height):
-        for j in range(maze.width):
-            if grid[i][j] == " " and (i, j) not in (maze.start, maze.goal):
-                if count_open_neighbors(i, j) <= 1:
-                    queue.append((i, j))
+    start_time = time.perf_counter()
 
+    meeting = start if start == goal else None
+    while meeting is None and layers[0] and layers[1]:
+        side = 0 if len(layers[0]) <= len(layers[1]) else 1
+        mine, other = parents[side], parents[1 - side]
+        depth, other_depth = depths[side], depths[1 - side]
+        best = None
+        next_layer = []
+
+        for state in layers[side]:
+            steps += 1
+            expanded.add(state)
+            added = []
+            for k in range(offsets[state], offsets[state + 1]):
+                neighbor = targets[k]
+                if neighbor not in mine:
+                    mine[neighbor] = state
+                    depth[neighbor] = depth[state] + 1
+                    next_layer.append(neighbor)
+                    if events:
+                        added.append(divmod(neighbor, width))
+                # Finish the layer and keep the shortest join through it
+                if neighbor in other:
+                    total = depth[state] + 1 + other_depth[neighbor]
+                    if best is None or total < best[0]:
+                        best = (total, state, neighbor)
+
+            if events:
+                cell = divmod(state, width)
+                yield {
+                    "status": "exploring",
+                    "current": cell,
+                    "expanded": [cell],
+                    "frontier_added": added,
+                    "direction": "forward" if side == 0 else "backward",
+                    "search": search,
+                    "path": None,
+                    "steps": steps,
+                    "duration": time.perf_counter() - start_time
+                }
+
+        layers = (next_layer, layers[1]) if side == 0 else (layers[0], next_layer)
+        if best is not None:
+            _, state, neighbor = best
+            # Re-point the crossing edge so both chains meet at one cell
+            if side == 0:
+                parents[0][neighbor] = state
+            else:
+                parents[1][neighbor] = state
+            meeting = neighbor
+
+    if meeting is None:
+        yield {
+            "status": "failed",
+            "path": None,
+            "explored": search.explored_cells(),
+            "search": search,
+            "steps": steps,
+            "duration": time.perf_counter() - start_time
+        }
+        return
+
+    yield {
+        "status": "done",
+        "path": _join_paths(parents, meeting, start, width),
+        "explored": search.explored_cells(),
+        "search": search,
+        "steps": steps,
+        "duration": time.perf_counter() - start_time
+    }
+
+
+def _relaxed_distance(maze, target):
+    # Lower bound on the number of moves from a cell to target: grid steps
+    # are Manhattan distance and every teleport hop is free. Pad distances
+    # are solved exactly with a small Dijkstra over the pads, so the bound
+    # stays consistent when several teleport pairs chain together.
+    tr, tc = target
+    if not maze.teleports:
+        return lambda r, c: abs(r - tr) + abs(c - tc)
+
+    def manhattan(a, b):
+        return abs(a[0] - b[0]) + abs(a[1] - b[1])
+
+    best = {pad: manhattan(pad, target) for pad in maze.teleports}
+    queue = [(distance, pad) for pad, distance in best.items()]
+    heapq.heapify(queue)
+    done = set()
     while queue:
-        i, j = queue.popleft()
-        if (i, j) == maze.start or (i, j) == maze.goal:
+        distance, pad = heapq.heappop(queue)
+        if pad in done:
             continue
+        done.add(pad)
+        for other in best:
+            if other in done:
+                continue
+            hop = 0 if maze.teleports[other] == pad else manhattan(other, pad)
+            if distance + hop < best[other]:
+                best[other] = distance + hop
+                heapq.heappush(queue, (best[other], other))
+
+    table = [(pr, pc, distance) for (pr, pc), distance in best.items()]
+
+    def estimate(r, c):
+        result = abs(r - tr) + abs(c - tc)
+        for pr, pc, distance in table:
+            via = abs(r - pr) + abs(c - pc) + distance
+            if via < result:
+                result = via
+        return result
+    return estimate
+
+
+def bidirectional_astar(maze, events=True):
+    # Bidirectional A* with average potentials, same step costs as astar.
+    # Both searches run Dijkstra on reduced costs, so the usual stop rule
+    # (top forward key + top backward key >= best path found) stays exact.
+    adjacency = maze.adjacency()
+    offsets, targets = adjacency.offsets, adjacency.targets
+    tiles = maze.tile_codes()
+    width = maze.width
+    start = maze.index(maze.start)
+    goal = maze.index(maze.goal)
+
+    min_cost = min(ASTAR_COSTS[code] for code in set(tiles) or {0})
+    to_goal = _relaxed_distance(maze, maze.goal)
+    to_start = _relaxed_distance(maze, maze.start)
+
+    def potential(state):
+        r, c = divmod(state, width)
+        return min_cost * (to_goal(r, c) - to_start(r, c)) / 2
+
+    search = SearchState(width)
+    expanded = search.expanded
+    frontiers = (PriorityFrontier(), PriorityFrontier())
+    costs = ({start: 0}, {goal: 0})
+    parents = ({start: -1}, {goal: -1})
+    closed = (set(), set())
+    frontiers[0].add(Node(state=start, parent=None, action=None), potential(start))
+    frontiers[1].add(Node(state=goal, parent=None, action=None), -potential(goal))
+
+    best = float("inf") if start != goal else 0
+    meeting = start if start == goal else None
+    steps = 0
+    start_time = time.perf_counter()
 
-        if grid[i][j] == "#":
-            continue
+    while not frontiers[0].empty() and not frontiers[1].empty():
+        if frontiers[0].min_priority() + frontiers[1].min_priority() >= best:
+            break
+
+        side = 0 if len(frontiers[0]) <= len(frontiers[1]) else 1
+        sign = 1 if side == 0 else -1
+        frontier = frontiers[side]
+        cost, other_cost = costs[side], costs[1 - side]
 
-        grid[i][j] = "#"
-        explored.add((i, j))
+        state = frontier.remove().state
+        closed[side].add(state)
+        expanded.add(state)
         steps += 1
+        added = []
+
+        for k in range(offsets[state], offsets[state + 1]):
+            neighbor = targets[k]
+            if neighbor in closed[side]:
+                continue
+            # Forward pays for the cell it enters, backward for the one it leaves
+            step = ASTAR_COSTS[tiles[neighbor]] if side == 0 else ASTAR_COSTS[tiles[state]]
+            new_cost = cost[state] + step
+            if neighbor not in cost or new_cost < cost[neighbor]:
+                cost[neighbor] = new_cost
+                parents[side][neighbor] = state
+                frontier.add(
+                    Node(state=neighbor, parent=None, action=None),
+                    new_cost + sign * potential(neighbor),
+                )
+                if events:
+                    added.append(divmod(neighbor, width))
+            if neighbor in other_cost and cost[neighbor] + other_cost[neighbor] < best:
+                best = cost[neighbor] + other_cost[neighbor]
+                meeting = neighbor
+
+        if events:
+            cell = divmod(state, width)
+            yield {
+                "status": "exploring",
+                "current": cell,
+                "expanded": [cell],
+                "frontier_added": added,
+                "direction": "forward" if side == 0 else "backward",
+                "search": search,
+                "path": None,
+                "steps": steps,
+                "duration": time.perf_counter() - start_time
+            }
 
+    if meeting is None:
         yield {
-            "status": "exploring",
-            "current": (i, j),
-            "explored": set(explored),
-            "path": [],
+            "status": "failed",
+            "path": None,
+            "explored": search.explored_cells(),
+            "search": search,
             "steps": steps,
             "duration": time.perf_counter() - start_time
         }
+        return
 
-        for di, dj in [(-1,0),(1,0),(0,-1),(0,1)]:
-            ni, nj = i + di, j + dj
-            if 0 <= ni < maze.height and 0 <= nj < maze.width:
-                if grid[ni][nj] == " " and count_open_neighbors(ni, nj) <= 1:
-                    queue.append((ni, nj))
-
-    # Optional: path after pruning
     yield {
         "status": "done",
-        "path": [],
-        "explored": explored,
+        "path": _join_paths(parents, meeting, start, width),
+        "cost": best,
+        "explored": search.explored_cells(),
+        "search": search,
         "steps": steps,
         "duration": time.perf_counter() - start_time
     }
 
 
-def _reconstruct_path(node, explored):
+def _join_paths(parents, meeting, start, width):
+    # start -> meeting from the forward tree, then meeting -> goal backwards
+    cells = []
+    state = meeting
+    while state != -1 and state != start:
+        cells.append(divmod(state, width))
+        state = parents[0][state]
+    cells.reverse()
+    state = parents[1][meeting]
+    while state != -1:
+        cells.append(divmod(state, width))
+        state = parents[1][state]
+    return cells
+
+
+def _jps_grid(maze):
+    # Cells JPS may jump across: plain open cells that all cost the same.
+    # Special tiles (N, P, T) are expanded normally, and every plain cell next
+    # to one is a forced stop so jumps never skip an entry into them.
+    tiles = maze.tile_codes()
+    width, height = maze.width, maze.height
+
+    plain_table = bytearray(256)
+    special_table = bytearray(256)
+    for code in (TILE_OPEN, TILE_START, TILE_GOAL):
+        plain_table[code] = 1
+    for code in range(len(TILE_CHARS)):
+        if not plain_table[code] and code != TILE_WALL:
+            special_table[code] = 1
+    plain = tiles.translate(plain_table)
+    special = tiles.translate(special_table)
+
+    near_special = bytearray(len(tiles))
+    index = special.find(1)
+    while index != -1:
+        r, c = divmod(index, width)
+        for nr, nc in ((r - 1, c), (r + 1, c), (r, c - 1), (r, c + 1)):
+            if 0 <= nr < height and 0 <= nc < width and plain[nr * width + nc]:
+                near_special[nr * width + nc] = 1
+        index = special.find(1, index + 1)
+
+    return plain, special, near_special
+
+
+def jps(maze, events=True):
+    # Jump Point Search for 4-connected grids, with astar's step costs.
+    # Straight runs through plain cells cost 1 per cell, so a jump's cost is
+    # its length; special tiles fall back to ordinary expansion.
+    adjacency = maze.adjacency()
+    offsets, targets = adjacency.offsets, adjacency.targets
+    tiles = maze.tile_codes()
+    plain, special, near_special = maze.cached("jps", _jps_grid)
+    width, height = maze.width, maze.height
+    start = maze.index(maze.start)
+    goal = maze.index(maze.goal)
+
+    min_cost = min(ASTAR_COSTS[code] for code in set(tiles) or {0})
+    to_goal = _relaxed_distance(maze, maze.goal)
+
+    def is_plain(r, c):
+        return 0 <= r < height and 0 <= c < width and plain[r * width + c]
+
+    def jump(r, c, dr, dc):
+        while True:
+            if not is_plain(r, c):
+                return -1
+            index = r * width + c
+            if index == goal or near_special[index]:
+                return index
+            if dc:
+                # Forced neighbor above or below that the parent couldn't reach
+                if (is_plain(r - 1, c) and not is_plain(r - 1, c - dc)) or \
+                        (is_plain(r + 1, c) and not is_plain(r + 1, c - dc)):
+                    return index
+            else:
+                if (is_plain(r, c - 1) and not is_plain(r - dr, c - 1)) or \
+                        (is_plain(r, c + 1) and not is_plain(r - dr, c + 1)):
+                    return index
+                # Vertical runs stop wherever a horizontal jump finds something
+                if jump(r, c + 1, 0, 1) != -1 or jump(r, c - 1, 0, -1) != -1:
+                    return index
+            r += dr
+            c += dc
+
+    def directions(state, parent):
+        if parent is None or not plain[parent]:
+            return ((-1, 0), (1, 0), (0, -1), (0, 1))
+        pr, pc = divmod(parent, width)
+        r, c = divmod(state, width)
+        dr = (r > pr) - (r < pr)
+        dc = (c > pc) - (c < pc)
+        if dc:
+            return ((-1, 0), (1, 0), (0, dc))
+        return ((0, -1), (0, 1), (dr, 0))
+
+    search = SearchState(width)
+    expanded = search.expanded
+    frontier = PriorityFrontier()
+    frontier.add(Node(state=start, parent=None, action=None), 0)
+    cost_so_far = {start: 0}
+    parents = {start: None}
+    steps = 0
+    start_time = time.perf_counter()
+
+    while not frontier.empty():
+        state = frontier.remove().state
+        steps += 1
+
+        if state == goal:
+            yield {
+                "status": "done",
+                "path": _interpolate_path(parents, goal, width, plain),
+                "cost": cost_so_far[goal],
+                "explored": search.explored_cells(),
+                "search": search,
+                "steps": steps,
+                "duration": time.perf_counter() - start_time
+            }
+            return
+
+        if state in expanded:
+            continue
+        expanded.add(state)
+        base_cost = cost_so_far[state]
+        successors = []
+
+        if plain[state]:
+            r, c = divmod(state, width)
+            for dr, dc in directions(state, parents[state]):
+                point = jump(r + dr, c + dc, dr, dc)
+                if point != -1:
+                    pr, pc = divmod(point, width)
+                    successors.append((point, abs(pr - r) + abs(pc - c)))
+            # Step straight into neighboring special tiles
+            for k in range(offsets[state], offsets[state + 1]):
+                if special[targets[k]]:
+                    successors.append((targets[k], ASTAR_COSTS[tiles[targets[k]]]))
+        else:
+            for k in range(offsets[state], offsets[state + 1]):
+                successors.append((targets[k], ASTAR_COSTS[tiles[targets[k]]]))
+
+        added = []
+        for point, step_cost in successors:
+            new_cost = base_cost + step_cost
+            if point not in cost_so_far or new_cost < cost_so_far[point]:
+                cost_so_far[point] = new_cost
+                parents[point] = state
+                r, c = divmod(point, width)
+                frontier.add(Node(state=point, parent=None, action=None), new_cost + min_cost * to_goal(r, c))
+                if events:
+                    added.append((r, c))
+
+        if events:
+            cell = divmod(state, width)
+            yield {
+                "status": "exploring",
+                "current": cell,
+                "expanded": [cell],
+                "frontier_added": added,
+                "search": search,
+                "path": None,
+                "steps": steps,
+                "duration": time.perf_counter() - start_time
+            }
+
+    yield {
+        "status": "failed",
+        "path": None,
+        "explored": search.explored_cells(),
+        "search": search,
+        "steps": steps,
+        "duration": time.perf_counter() - start_time
+    }
+
+
+def _interpolate_path(parents, goal, width, plain):
+    # Plain -> plain links are straight jumps, fill in the cells between them;
+    # anything touching a special tile is a single step or a teleport hop
+    cells = []
+    state = goal
+    while parents[state] is not None:
+        parent = parents[state]
+        r, c = divmod(state, width)
+        if plain[state] and plain[parent]:
+            pr, pc = divmod(parent, width)
+            dr = (pr > r) - (pr < r)
+            dc = (pc > c) - (pc < c)
+            while (r, c) != (pr, pc):
+                cells.append((r, c))
+                r += dr
+                c += dc
+        else:
+            cells.append((r, c))
+        state = parent
+    cells.reverse()
+    return cells
+
+
+# Every solver is a generator of events. With events=False it skips the
+# per-step "exploring" events and only yields the final done/failed result.
+SOLVERS = {
+    "bfs": bfs,
+    "dfs": dfs,
+    "astar": astar,
+    "alt": alt_astar,
+    "dijkstra": dijkstra,
+    "lhr": lhr,
+    "rhr": rhr,
+    "deadendfill": deadendfill,
+    "bibfs": bidirectional_bfs,
+    "biastar": bidirectional_astar,
+    "jps": jps,
+}
+
+
+def run_to_completion(solver, maze):
+    result = None
+    for result in solver(maze, events=False):
+        pass
+    return result
+
+
+def _reconstruct_path(node, width):
+    # Nodes hold flat indices and action codes, hand back names and (row, col)
     actions = []
     cells = []
     while node.parent is not None:
-        actions.append(node.action)
-        cells.append(node.state)
+        actions.append(ACTIONS[node.action])
+        cells.append(divmod(node.state, width))
         node = node.parent
     actions.reverse()
     cells.reverse()
@@ -0,0 +1,229 @@
+# array_maze.py
+import os
+from array import array
+
+import numpy as np
+
+from core import (
+    TILE_OPEN, TILE_WALL, TILE_START, TILE_GOAL,
+    TILE_TELEPORT, TILE_ENCOURAGE, TILE_PENALTY, TILE_CHARS, CHAR_TILES
+)
+from adjacency import Adjacency, UP, DOWN, LEFT, RIGHT, TELEPORT
+from maze import Maze, _check_endpoints
+
+
+# Byte -> tile code lookup, unknown characters are walls
+_ENCODE = np.full(256, TILE_WALL, dtype=np.uint8)
+for _char, _code in CHAR_TILES.items():
+    _ENCODE[ord(_char)] = _code
+
+# Tile code -> character, used to decode rows back into strings
+_DECODE = bytes(ord(TILE_CHARS[i]) if i < len(TILE_CHARS) else ord("#") for i in range(256))
+
+# Per-tile step cost, same values as Maze.get_cost
+_COSTS = np.full(len(TILE_CHARS), 2, dtype=np.uint8)
+_COSTS[TILE_ENCOURAGE] = 1
+_COSTS[TILE_PENALTY] = 5
+
+
+class _GridView:
+    """Read-only stand-in for Maze.grid, decodes one row at a time."""
+
+    def __init__(self, tiles):
+        self.tiles = tiles
+
+    def __len__(self):
+        return self.tiles.shape[0]
+
+    def __getitem__(self, i):
+        return self.tiles[i].tobytes().translate(_DECODE).decode("ascii")
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+
+class _TileSet:
+    """Set-like view of every cell holding one tile code."""
+
+    def __init__(self, tiles, code):
+        self.tiles = tiles
+        self.code = code
+
+    def __contains__(self, position):
+        r, c = position
+        height, width = self.tiles.shape
+        return 0 <= r < height and 0 <= c < width and self.tiles[r, c] == self.code
+
+    def __iter__(self):
+        width = self.tiles.shape[1]
+        for index in np.flatnonzero(self.tiles == self.code).tolist():
+            yield divmod(index, width)
+
+    def __len__(self):
+        return int(np.count_nonzero(self.tiles == self.code))
+
+
+class ArrayMaze(Maze):
+    """Maze backed by a single uint8 tile-code array.
+
+    Keeps the Maze API (walls[i][j], neighbors, get_cost, start/goal) so the
+    solvers and the canvas work unchanged, at one byte per cell.
+    """
+
+    def __init__(self, filename):
+        with open(filename, "rb") as f:
+            contents = f.read()
+
+        lines = contents.splitlines()
+        width = max((len(line) for line in lines), default=0)
+
+        # Short lines are padded with open cells, like Maze does
+        raw = np.full((len(lines), width), ord(" "), dtype=np.uint8)
+        for i, line in enumerate(lines):
+            raw[i, :len(line)] = np.frombuffer(line, dtype=np.uint8)
+
+        self._setup(_ENCODE[raw])
+
+    @classmethod
+    def from_tiles(cls, tiles):
+        maze = cls.__new__(cls)
+        maze._setup(np.ascontiguousarray(tiles, dtype=np.uint8))
+        return maze
+
+    @classmethod
+    def from_maze(cls, maze):
+        tiles = np.full((maze.height, maze.width), TILE_OPEN, dtype=np.uint8)
+        for i, row in enumerate(maze.grid):
+            encoded = np.frombuffer("".join(row).encode("ascii", "replace"), dtype=np.uint8)
+            tiles[i, :len(encoded)] = _ENCODE[encoded]
+        return cls.from_tiles(tiles)
+
+    def _setup(self, tiles):
+        self.filepath = "assets"
+        os.makedirs(self.filepath, exist_ok=True)
+
+        self.tiles = tiles
+        self.height, self.width = tiles.shape
+
+        if np.count_nonzero(tiles == TILE_START) != 1:
+            raise Exception("Maze must have exactly one start point")
+        if np.count_nonzero(tiles == TILE_GOAL) != 1:
+            raise Exception("Maze must have exactly one goal")
+
+        self.start = self.state_of(int(np.flatnonzero(tiles == TILE_START)[0]))
+        self.goal = self.state_of(int(np.flatnonzero(tiles == TILE_GOAL)[0]))
+
+        self.grid = _GridView(tiles)
+        self.walls = self.wall_mask()
+        self.encouragements = _TileSet(tiles, TILE_ENCOURAGE)
+        self.penalties = _TileSet(tiles, TILE_PENALTY)
+
+        # Teleports are sparse, so the pairs stay in a plain dict
+        self.teleport_locations = [
+            self.state_of(index) for index in np.flatnonzero(tiles == TILE_TELEPORT).tolist()
+        ]
+        self._pair_teleports()
+
+        self.solution = None
+        self.explored = set()
+
+        self.version = 0
+        self._cache = {}
+
+    # Vectorized masks over the whole maze
+    def mask(self, code):
+        return self.tiles == code
+
+    def wall_mask(self):
+        return self.tiles == TILE_WALL
+
+    def open_mask(self):
+        return self.tiles != TILE_WALL
+
+    def cost_array(self):
+        return _COSTS[self.tiles]
+
+    def flat_tiles(self):
+        return self.tiles.reshape(-1)
+
+    def adjacency(self):
+        return self.cached("adjacency", _build_adjacency)
+
+    def tile_codes(self):
+        return self.cached("tile_codes", lambda maze: bytearray(maze.tiles.tobytes()))
+
+    def set_tile(self, state, char):
+        i, j = state
+        _check_endpoints(self, state, char)
+        code = CHAR_TILES.get(char, TILE_WALL)
+        previous = int(self.tiles[i, j])
+
+        if code == TILE_START and self.start != state:
+            self.tiles[self.start] = TILE_OPEN
+            self.start = state
+        elif code == TILE_GOAL and self.goal != state:
+            self.tiles[self.goal] = TILE_OPEN
+            self.goal = state
+
+        self.tiles[i, j] = code
+        self.walls[i, j] = code == TILE_WALL
+
+        if previous == TILE_TELEPORT or code == TILE_TELEPORT:
+            self.teleport_locations = [
+                self.state_of(index)
+                for index in np.flatnonzero(self.tiles == TILE_TELEPORT).tolist()
+            ]
+            self._pair_teleports()
+        self.invalidate()
+
+    def get_cost(self, position):
+        return int(_COSTS[self.tiles[position[0], position[1]]])
+
+    def is_valid(self, position):
+        i, j = position
+        return 0 <= i < self.height and 0 <= j < self.width and not self.walls[i, j]
+
+
+def _build_adjacency(maze):
+    # Same edge order as adjacency.build_adjacency, built with array shifts
+    height, width = maze.height, maze.width
+    n = height * width
+    open_cells = maze.open_mask()
+    index = np.arange(n, dtype=np.int32).reshape(height, width)
+
+    candidates = np.full((height, width, 5), -1, dtype=np.int32)
+    candidates[1:, :, UP] = np.where(open_cells[:-1, :], index[:-1, :], -1)
+    candidates[:-1, :, DOWN] = np.where(open_cells[1:, :], index[1:, :], -1)
+    candidates[:, 1:, LEFT] = np.where(open_cells[:, :-1], index[:, :-1], -1)
+    candidates[:, :-1, RIGHT] = np.where(open_cells[:, 1:], index[:, 1:], -1)
+
+    teleports = {maze.index(a): maze.index(b) for a, b in maze.teleports.items()}
+    flat = candidates.reshape(n, 5)
+    for pad, partner in teleports.items():
+        flat[pad, TELEPORT] = partner
+
+    # Walls get no edges, a search can't start or pass there
+    flat[~open_cells.reshape(n)] = -1
+    present = flat >= 0
+    offsets = np.zeros(n + 1, dtype=np.int32)
+    np.cumsum(present.sum(axis=1), out=offsets[1:])
+    targets = flat[present]
+    actions = np.broadcast_to(np.arange(5, dtype=np.int8), flat.shape)[present]
+
+    return Adjacency(
+        width,
+        _to_array("i", offsets),
+        _to_array("i", targets),
+        _to_array("b", actions),
+        teleports,
+    )
+
+
+_ARRAY_DTYPES = {"b": np.int8, "i": np.int32}
+
+
+def _to_array(typecode, values):
+    result = array(typecode)
+    result.frombytes(np.ascontiguousarray(values, dtype=_ARRAY_DTYPES[typecode]).tobytes())
+    return result
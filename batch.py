@@ -0,0 +1,154 @@
+# batch.py
+#
+# Headless batch solving, no Qt needed:
+#
+#   python batch.py assets "Cs50_ai/maze*.txt" -a bfs astar -o results.csv
+#   python batch.py assets -a all -o results.jsonl --workers 8
+import argparse
+import csv
+import glob
+import json
+import os
+import resource
+import sys
+import time
+import tracemalloc
+from multiprocessing import Pool
+
+from algorithms import SOLVERS, run_to_completion
+from binary_maze import EXTENSION, is_binary, load_binary
+from maze import Maze
+
+
+FIELDS = [
+    "maze", "algorithm", "status", "path_length", "steps",
+    "duration", "peak_rss_kb", "peak_alloc_kb", "error",
+]
+
+
+def collect_mazes(patterns):
+    paths = []
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            matches = glob.glob(os.path.join(pattern, "*.txt"))
+            matches += glob.glob(os.path.join(pattern, "*" + EXTENSION))
+        else:
+            matches = glob.glob(pattern)
+        paths.extend(sorted(matches))
+    # Keep the first occurrence of every file
+    return list(dict.fromkeys(paths))
+
+
+def load(path, compact):
+    if is_binary(path):
+        return load_binary(path)
+    if compact:
+        from array_maze import ArrayMaze
+        return ArrayMaze(path)
+    return Maze(path)
+
+
+def solve_one(path, algorithm, compact=False, trace_memory=False):
+    row = dict.fromkeys(FIELDS)
+    row.update(maze=path, algorithm=algorithm)
+    try:
+        maze = load(path, compact)
+        if trace_memory:
+            tracemalloc.start()
+        start_time = time.perf_counter()
+        result = run_to_completion(SOLVERS[algorithm], maze)
+        duration = time.perf_counter() - start_time
+        if trace_memory:
+            row["peak_alloc_kb"] = tracemalloc.get_traced_memory()[1] // 1024
+            tracemalloc.stop()
+
+        row.update(
+            status=result["status"],
+            path_length=len(result["path"]) if result["path"] else 0,
+            steps=result["steps"],
+            duration=round(duration, 6),
+        )
+    except Exception as e:
+        row.update(status="error", error=str(e))
+    # ru_maxrss is the worker's peak so far, in KiB on Linux; workers are
+    # replaced after every task, so that's this solve's peak
+    row["peak_rss_kb"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return row
+
+
+def _solve_task(task):
+    return solve_one(*task)
+
+
+class ResultWriter:
+    def __init__(self, stream, fmt):
+        self.stream = stream
+        self.fmt = fmt
+        if fmt == "csv":
+            self.writer = csv.DictWriter(stream, fieldnames=FIELDS)
+            self.writer.writeheader()
+
+    def write(self, row):
+        if self.fmt == "csv":
+            self.writer.writerow(row)
+        else:
+            self.stream.write(json.dumps(row) + "\n")
+        # Flush per row so results stream out as they finish
+        self.stream.flush()
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description="Solve a batch of mazes without the GUI.")
+    parser.add_argument("mazes", nargs="+", help="maze .txt/.mazb files, directories or glob patterns")
+    parser.add_argument(
+        "-a", "--algorithms", nargs="+", default=["bfs"],
+        help=f"solvers to run: {', '.join(SOLVERS)} or 'all'",
+    )
+    parser.add_argument("-o", "--output", default="-", help="output file, '-' for stdout")
+    parser.add_argument(
+        "-f", "--format", choices=["csv", "jsonl"],
+        help="output format, guessed from the output extension by default",
+    )
+    parser.add_argument("-w", "--workers", type=int, default=None, help="worker processes")
+    parser.add_argument("--compact", action="store_true", help="load mazes as ArrayMaze")
+    parser.add_argument(
+        "--trace-memory", action="store_true",
+        help="also record peak Python allocations per solve (slows solving down)",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    algorithms = list(SOLVERS) if args.algorithms == ["all"] else args.algorithms
+    unknown = [name for name in algorithms if name not in SOLVERS]
+    if unknown:
+        sys.exit(f"Unknown algorithm(s): {', '.join(unknown)}")
+
+    paths = collect_mazes(args.mazes)
+    if not paths:
+        sys.exit("No maze files found.")
+
+    fmt = args.format or ("jsonl" if args.output.endswith((".jsonl", ".json")) else "csv")
+    stream = sys.stdout if args.output == "-" else open(args.output, "w", newline="")
+    writer = ResultWriter(stream, fmt)
+
+    try:
+        # A fresh worker per solve, or ru_maxrss would carry over the
+        # biggest maze a worker has seen so far
+        with Pool(args.workers, maxtasksperchild=1) as pool:
+            tasks = [
+                (path, algorithm, args.compact, args.trace_memory)
+                for path in paths
+                for algorithm in algorithms
+            ]
+            for row in pool.imap_unordered(_solve_task, tasks):
+                writer.write(row)
+    finally:
+        if stream is not sys.stdout:
+            stream.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+# benchmarks/frontier_scaling.py
+#
+# Compares the old list-backed frontiers (slice on pop, linear contains_state)
+# with the indexed ones in core.py, then times dfs/bfs end to end on open-room
+# mazes of growing size.
+#
+#   python -m benchmarks.frontier_scaling
+import time
+
+import numpy as np
+
+from algorithms import bfs, dfs
+from array_maze import ArrayMaze
+from core import (
+    Node, StackFrontier, QueueFrontier, TILE_OPEN, TILE_WALL, TILE_START, TILE_GOAL
+)
+
+
+class ListStackFrontier():
+    # The pre-index implementation, kept here only as a baseline
+    def __init__(self):
+        self.frontier = []
+
+    def add(self, node):
+        self.frontier.append(node)
+
+    def contains_state(self, state):
+        return any(node.state == state for node in self.frontier)
+
+    def empty(self):
+        return len(self.frontier) == 0
+
+    def remove(self):
+        node = self.frontier[-1]
+        self.frontier = self.frontier[:-1]
+        return node
+
+
+class ListQueueFrontier(ListStackFrontier):
+
+    def remove(self):
+        node = self.frontier[0]
+        self.frontier = self.frontier[1:]
+        return node
+
+
+def open_room(size):
+    tiles = np.full((size, size), TILE_OPEN, dtype=np.uint8)
+    tiles[0, :] = tiles[-1, :] = tiles[:, 0] = tiles[:, -1] = TILE_WALL
+    tiles[1, 1] = TILE_START
+    tiles[-2, -2] = TILE_GOAL
+    return ArrayMaze.from_tiles(tiles)
+
+
+def drive(frontier_class, maze):
+    # Plain graph search that only exercises the frontier operations
+    adjacency = maze.adjacency()
+    offsets, targets = adjacency.offsets, adjacency.targets
+    frontier = frontier_class()
+    frontier.add(Node(state=maze.index(maze.start), parent=None, action=None))
+    expanded = set()
+    start_time = time.perf_counter()
+    while not frontier.empty():
+        node = frontier.remove()
+        if node.state in expanded:
+            continue
+        expanded.add(node.state)
+        for k in range(offsets[node.state], offsets[node.state + 1]):
+            state = targets[k]
+            if state not in expanded and not frontier.contains_state(state):
+                frontier.add(Node(state=state, parent=node, action=None))
+    return time.perf_counter() - start_time, len(expanded)
+
+
+def run_solver(solver, maze):
+    start_time = time.perf_counter()
+    for step in solver(maze):
+        pass
+    return time.perf_counter() - start_time, step["steps"]
+
+
+def main():
+    print(f"{'frontier':<18}{'cells':>10}{'list (s)':>12}{'indexed (s)':>14}{'speedup':>10}")
+    for size in (20, 40, 80, 120):
+        maze = open_room(size)
+        for name, old, new in (
+            ("stack (dfs)", ListStackFrontier, StackFrontier),
+            ("queue (bfs)", ListQueueFrontier, QueueFrontier),
+        ):
+            old_time, cells = drive(old, maze)
+            new_time, _ = drive(new, maze)
+            print(f"{name:<18}{cells:>10}{old_time:>12.4f}{new_time:>14.4f}{old_time / new_time:>9.1f}x")
+
+    print()
+    print(f"{'solver':<18}{'cells':>10}{'time (s)':>12}{'us/step':>14}")
+    for size in (100, 200, 400):
+        maze = open_room(size)
+        for solver in (dfs, bfs):
+            duration, steps = run_solver(solver, maze)
+            print(f"{solver.__name__:<18}{size * size:>10}{duration:>12.4f}{duration / steps * 1e6:>14.2f}")
+
+
+if __name__ == "__main__":
+    main()
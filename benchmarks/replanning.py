@@ -0,0 +1,96 @@
+# benchmarks/replanning.py
+#
+# Re-plan cost of the incremental LPA* planner against a cold astar run
+# after every batch of live edits: walls dropped onto the current path,
+# walls knocked out elsewhere, and now and then a goal move.
+#
+#   python -m benchmarks.replanning
+#   python -m benchmarks.replanning --cells 1e6 --variant special --batches 20
+import argparse
+import random
+import statistics
+import tempfile
+import time
+
+from algorithms import astar, run_to_completion
+from array_maze import ArrayMaze
+from benchmarks.suite import VARIANTS, build_maze, write_maze
+from core import TILE_WALL
+from replanner import Replanner
+
+
+def edit_batch(maze, path, rng, size):
+    # Block a few cells of the current path and open a few random walls
+    edits = []
+    candidates = [cell for cell in path or () if cell != maze.goal]
+    for cell in rng.sample(candidates, min(len(candidates), max(1, size // 2))):
+        edits.append((cell, "#"))
+    tiles = maze.tile_codes()
+    while len(edits) < size:
+        cell = (rng.randrange(1, maze.height - 1), rng.randrange(1, maze.width - 1))
+        if tiles[maze.index(cell)] == TILE_WALL:
+            edits.append((cell, " "))
+    return edits
+
+
+def goal_move(maze, rng):
+    tiles = maze.tile_codes()
+    while True:
+        cell = (rng.randrange(1, maze.height - 1), rng.randrange(1, maze.width - 1))
+        if tiles[maze.index(cell)] != TILE_WALL and cell != maze.start:
+            return [(cell, "B")]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Incremental re-planning vs cold astar.")
+    parser.add_argument("--cells", type=float, default=1e5)
+    parser.add_argument("--variant", choices=VARIANTS, default="open")
+    parser.add_argument("--batches", type=int, default=20)
+    parser.add_argument("--edits", type=int, default=4, help="cells changed per batch")
+    parser.add_argument("--goal-every", type=int, default=5, help="move the goal every n batches")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = write_maze(build_maze(int(args.cells), args.variant, args.seed), directory, "maze")
+        maze = ArrayMaze(path)
+    rng = random.Random(args.seed)
+
+    start_time = time.perf_counter()
+    planner = Replanner(maze)
+    result = planner.plan()
+    print(f"initial plan: {time.perf_counter() - start_time:.3f}s, {result['steps']} expansions")
+
+    print(f"\n{'batch':>5} {'edit':<6}{'replan (s)':>11}{'expanded':>10}{'astar (s)':>11}{'expanded':>10}{'speedup':>9}")
+    replans, colds = [], []
+    for batch in range(1, args.batches + 1):
+        if args.goal_every and batch % args.goal_every == 0:
+            kind, edits = "goal", goal_move(maze, rng)
+        else:
+            kind, edits = "walls", edit_batch(maze, result["path"], rng, args.edits)
+
+        start_time = time.perf_counter()
+        planner.apply(edits)
+        result = planner.plan()
+        replan = time.perf_counter() - start_time
+
+        # Cold: the edit dropped the maze's caches, so this rebuilds them too
+        start_time = time.perf_counter()
+        cold = run_to_completion(astar, maze)
+        cold_time = time.perf_counter() - start_time
+
+        replans.append(replan)
+        colds.append(cold_time)
+        print(
+            f"{batch:>5} {kind:<6}{replan:>11.4f}{result['steps']:>10}"
+            f"{cold_time:>11.4f}{cold['steps']:>10}{cold_time / replan:>8.1f}x"
+        )
+
+    print(
+        f"\nmedian replan {statistics.median(replans):.4f}s, "
+        f"median cold astar {statistics.median(colds):.4f}s"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,257 @@
+# benchmarks/suite.py
+#
+# Reproducible solver benchmarks over seeded mazes.
+#
+#   python -m benchmarks.suite                        # 10^2 .. 10^5 cells
+#   python -m benchmarks.suite --max-cells 1e7 -o bench.json
+#   python -m benchmarks.suite --compare old.json -o new.json
+#
+# Every (maze, solver) case runs in a fresh worker process so its peak RSS is
+# its own. Solvers run to completion with events=False, after a warmup run.
+import argparse
+import json
+import math
+import os
+import platform
+import random
+import resource
+import statistics
+import subprocess
+import tempfile
+import time
+from multiprocessing import Pool
+
+from Generate_maze import engine
+
+
+SOLVER_NAMES = [
+    "bfs", "dfs", "astar", "alt", "dijkstra", "lhr", "rhr", "deadendfill", "bibfs", "biastar", "jps",
+]
+VARIANTS = ["perfect", "open", "special"]
+# Solvers that take queue= (heap or bucket)
+QUEUE_SOLVERS = {"astar", "alt", "dijkstra"}
+
+
+def side_for(cells):
+    # Odd side so the carved grid has a full border
+    return int(math.sqrt(cells)) | 1
+
+
+def build_maze(cells, variant, seed, algorithm="backtracker"):
+    side = side_for(cells)
+    walkable = (side // 2) ** 2
+    if variant == "special":
+        # Roughly 5% penalty, 5% boost and a teleport pair per ~1000 cells
+        grid = engine.generate(
+            side, side,
+            num_penalty=walkable // 20,
+            num_boost=walkable // 20,
+            num_teleport=2 * max(1, walkable // 1000),
+            algorithm=algorithm,
+            seed=seed,
+        )
+    else:
+        grid = engine.generate(side, side, algorithm=algorithm, seed=seed)
+
+    if variant == "open":
+        open_rooms(grid, random.Random(seed))
+    return grid
+
+
+def open_rooms(grid, rng):
+    # Knock rectangular rooms into the carved maze, about a third of its area
+    rows, cols = grid.shape
+    target = rows * cols // 3
+    opened = 0
+    while opened < target:
+        h = rng.randint(3, max(3, rows // 4))
+        w = rng.randint(3, max(3, cols // 4))
+        top = rng.randrange(1, max(2, rows - h - 1))
+        left = rng.randrange(1, max(2, cols - w - 1))
+        room = grid[top:min(top + h, rows - 1), left:min(left + w, cols - 1)]
+        room[room == engine.WALL] = engine.OPEN
+        opened += h * w
+
+
+def write_maze(grid, directory, name):
+    path = os.path.join(directory, name + ".txt")
+    engine.save(grid, path)
+    return path
+
+
+def run_case(path, solver_name, repeats, warmup, queue=None):
+    # Runs in a fresh worker process
+    from functools import partial
+    from algorithms import SOLVERS, run_to_completion
+    from array_maze import ArrayMaze
+
+    load_start = time.perf_counter()
+    maze = ArrayMaze(path)
+    load_time = time.perf_counter() - load_start
+
+    setup_start = time.perf_counter()
+    maze.adjacency()
+    maze.tile_codes()
+    setup_time = time.perf_counter() - setup_start
+
+    solver = SOLVERS[solver_name]
+    if queue:
+        solver = partial(solver, queue=queue)
+    for _ in range(warmup):
+        run_to_completion(solver, maze)
+
+    durations = []
+    result = None
+    for _ in range(repeats):
+        start_time = time.perf_counter()
+        result = run_to_completion(solver, maze)
+        durations.append(time.perf_counter() - start_time)
+
+    best = min(durations)
+    return {
+        "status": result["status"],
+        "path_length": len(result["path"]) if result["path"] else 0,
+        "steps": result["steps"],
+        "load_s": load_time,
+        "setup_s": setup_time,
+        "best_s": best,
+        "median_s": statistics.median(durations),
+        "durations_s": durations,
+        "expansions_per_s": result["steps"] / best if best > 0 else None,
+        "peak_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    }
+
+
+def git_revision():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def case_key(case):
+    # Results from before the queue option ran on the heap
+    return (case["cells"], case["variant"], case["algorithm"], case.get("queue") or "heap")
+
+
+def case_label(case):
+    if case.get("queue"):
+        return f"{case['algorithm']}/{case['queue']}"
+    return case["algorithm"]
+
+
+def compare(baseline_path, results):
+    with open(baseline_path) as f:
+        baseline = {case_key(case): case for case in json.load(f)["results"]}
+
+    print(f"\n{'cells':>10} {'variant':<9}{'algorithm':<16}{'old (s)':>10}{'new (s)':>10}{'speedup':>9}")
+    for case in results:
+        old = baseline.get(case_key(case))
+        if not old or "best_s" not in old or "best_s" not in case:
+            continue
+        ratio = old["best_s"] / case["best_s"] if case["best_s"] else float("inf")
+        print(
+            f"{case['cells']:>10} {case['variant']:<9}{case_label(case):<16}"
+            f"{old['best_s']:>10.4f}{case['best_s']:>10.4f}{ratio:>8.2f}x"
+        )
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description="Benchmark every solver on seeded mazes.")
+    parser.add_argument("--min-cells", type=float, default=1e2)
+    parser.add_argument("--max-cells", type=float, default=1e5)
+    parser.add_argument("--variants", nargs="+", choices=VARIANTS, default=VARIANTS)
+    parser.add_argument("--algorithms", nargs="+", choices=SOLVER_NAMES, default=SOLVER_NAMES)
+    parser.add_argument(
+        "--queues", nargs="+", choices=["heap", "bucket"], default=["heap"],
+        help="priority queues to run astar and dijkstra on",
+    )
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--warmup", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--generator", choices=list(engine.ALGORITHMS), default="backtracker",
+        help="maze carving algorithm",
+    )
+    parser.add_argument("-o", "--output", default="bench_results.json")
+    parser.add_argument("--compare", help="earlier results file to compare against")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    sizes = []
+    exponent = round(math.log10(args.min_cells))
+    while 10 ** exponent <= args.max_cells:
+        sizes.append(10 ** exponent)
+        exponent += 1
+
+    results = []
+    with tempfile.TemporaryDirectory() as directory:
+        # One fresh process per case keeps peak RSS numbers independent
+        with Pool(1, maxtasksperchild=1) as pool:
+            for cells in sizes:
+                for variant in args.variants:
+                    gen_start = time.perf_counter()
+                    grid = build_maze(cells, variant, args.seed, args.generator)
+                    gen_time = time.perf_counter() - gen_start
+                    path = write_maze(grid, directory, f"{variant}_{cells}")
+                    del grid
+
+                    runs = [
+                        (algorithm, queue)
+                        for algorithm in args.algorithms
+                        for queue in (args.queues if algorithm in QUEUE_SOLVERS else [None])
+                    ]
+                    for algorithm, queue in runs:
+                        case = {
+                            "cells": cells,
+                            "side": side_for(cells),
+                            "variant": variant,
+                            "algorithm": algorithm,
+                            "queue": queue,
+                            "seed": args.seed,
+                            "generator": args.generator,
+                            "generate_s": gen_time,
+                        }
+                        try:
+                            case.update(pool.apply(
+                                run_case, (path, algorithm, args.repeats, args.warmup, queue)
+                            ))
+                        except Exception as e:
+                            case["error"] = str(e)
+                        results.append(case)
+                        print(
+                            f"{cells:>10} {variant:<9}{case_label(case):<16}"
+                            f"{case.get('status', 'error'):<8}"
+                            f"{case.get('best_s', float('nan')):>10.4f}s "
+                            f"{case.get('expansions_per_s') or 0:>12.0f} exp/s "
+                            f"{case.get('peak_rss_kb', 0):>9} KiB",
+                            flush=True,
+                        )
+
+    report = {
+        "meta": {
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "revision": git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "repeats": args.repeats,
+            "warmup": args.warmup,
+        },
+        "results": results,
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nResults written to {args.output}")
+
+    if args.compare:
+        compare(args.compare, results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,213 @@
+# binary_maze.py
+#
+# Compact binary maze files (.mazb) and converters to/from the text format.
+#
+#   python binary_maze.py assets/maze1.txt assets/maze1.mazb
+#   python binary_maze.py assets/maze1.mazb assets/maze1_copy.txt
+#
+# Layout, little-endian, every section starting on an 8-byte boundary:
+#   header         HEADER below: magic, version, height, width, start, goal,
+#                  number of teleport pads and of special tiles
+#   teleport pads  (n_pads, 2) uint32 (row, col) in reading order, pads are
+#                  paired two by two like Maze pairs them
+#   special tiles  n_specials uint64 flat indices (sorted), then n_specials
+#                  uint8 tile codes (encouragement, penalty, ...)
+#   wall plane     (height, ceil(width / 8)) uint8, one bit per cell, rows
+#                  padded to whole bytes, least significant bit first
+import mmap
+import struct
+import sys
+
+import numpy as np
+
+from core import TILE_OPEN, TILE_WALL, TILE_START, TILE_GOAL, TILE_TELEPORT, TILE_CHARS
+
+MAGIC = b"MAZB"
+VERSION = 1
+EXTENSION = ".mazb"
+
+HEADER = struct.Struct("<4sHHIIIIIIIQ")
+
+# Tiles that go in the sparse table, everything but walls, open cells and
+# the ones the header already covers
+_NOT_SPECIAL = (TILE_OPEN, TILE_WALL, TILE_START, TILE_GOAL, TILE_TELEPORT)
+
+_CHARS = np.frombuffer(TILE_CHARS.encode("ascii"), dtype=np.uint8)
+
+
+def _align(offset):
+    return (offset + 7) & ~7
+
+
+def _layout(height, width, n_pads, n_specials):
+    # Section offsets follow from the header, so they aren't stored
+    pads = _align(HEADER.size)
+    indices = _align(pads + n_pads * 8)
+    codes = indices + n_specials * 8
+    walls = _align(codes + n_specials)
+    stride = (width + 7) // 8
+    return pads, indices, codes, walls, stride
+
+
+def is_binary(path):
+    with open(path, "rb") as f:
+        return f.read(len(MAGIC)) == MAGIC
+
+
+class MazeFile:
+    """A .mazb file mapped into memory.
+
+    Opening only parses the header and the sparse tables; the wall plane is
+    read straight from the mapping, block by block, as it's asked for.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, "rb")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        (magic, version, _, height, width, start_r, start_c,
+         goal_r, goal_c, n_pads, n_specials) = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC:
+            raise Exception(f"{path} is not a binary maze file")
+        if version != VERSION:
+            raise Exception(f"Unsupported binary maze version {version}")
+
+        self.height, self.width = height, width
+        self.start = (start_r, start_c)
+        self.goal = (goal_r, goal_c)
+
+        pads, indices, codes, walls, self.stride = _layout(height, width, n_pads, n_specials)
+        pad_cells = np.frombuffer(self._map, dtype="<u4", count=2 * n_pads, offset=pads)
+        self.teleport_locations = [tuple(cell) for cell in pad_cells.reshape(-1, 2).tolist()]
+        self.teleports = {}
+        for i in range(0, n_pads - 1, 2):
+            a, b = self.teleport_locations[i], self.teleport_locations[i + 1]
+            self.teleports[a] = b
+            self.teleports[b] = a
+
+        self.special_indices = np.frombuffer(self._map, dtype="<u8", count=n_specials, offset=indices)
+        self.special_codes = np.frombuffer(self._map, dtype=np.uint8, count=n_specials, offset=codes)
+        self.wall_bits = np.frombuffer(
+            self._map, dtype=np.uint8, count=height * self.stride, offset=walls
+        ).reshape(height, self.stride)
+
+    def close(self):
+        # Drop the numpy views first, mmap refuses to close while exported
+        self.special_indices = self.special_codes = self.wall_bits = None
+        self._map.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def is_wall(self, r, c):
+        return bool(self.wall_bits[r, c >> 3] >> (c & 7) & 1)
+
+    def wall_block(self, top, bottom, left, right):
+        """Wall mask of rows [top, bottom) and columns [left, right)."""
+        first = left >> 3
+        bits = np.unpackbits(
+            self.wall_bits[top:bottom, first:(right + 7) >> 3], axis=1, bitorder="little"
+        )
+        shift = left - first * 8
+        return bits[:, shift:shift + right - left].astype(bool)
+
+    def tile_block(self, top, bottom, left, right):
+        """Tile codes of rows [top, bottom) and columns [left, right)."""
+        tiles = np.where(self.wall_block(top, bottom, left, right), TILE_WALL, TILE_OPEN).astype(np.uint8)
+
+        # Specials are sorted by flat index, so the block's rows are one slice
+        lo, hi = np.searchsorted(self.special_indices, [top * self.width, bottom * self.width])
+        rows, cols = np.divmod(self.special_indices[lo:hi].astype(np.int64), self.width)
+        inside = (cols >= left) & (cols < right)
+        tiles[rows[inside] - top, cols[inside] - left] = self.special_codes[lo:hi][inside]
+
+        for cells, code in (
+            (self.teleport_locations, TILE_TELEPORT),
+            ([self.start], TILE_START),
+            ([self.goal], TILE_GOAL),
+        ):
+            for r, c in cells:
+                if top <= r < bottom and left <= c < right:
+                    tiles[r - top, c - left] = code
+        return tiles
+
+    def tiles(self):
+        return self.tile_block(0, self.height, 0, self.width)
+
+
+def save_binary(maze, path):
+    """Write any Maze (or ArrayMaze) as a .mazb file."""
+    height, width = maze.height, maze.width
+    tiles = np.frombuffer(bytes(maze.tile_codes()), dtype=np.uint8)
+
+    special = ~np.isin(tiles, _NOT_SPECIAL)
+    special_indices = np.flatnonzero(special).astype("<u8")
+    special_codes = tiles[special]
+    pad_cells = np.array(maze.teleport_locations, dtype="<u4").reshape(-1, 2)
+
+    walls = np.packbits((tiles == TILE_WALL).reshape(height, width), axis=1, bitorder="little")
+
+    pads, indices, codes, wall_offset, _ = _layout(
+        height, width, len(pad_cells), len(special_indices)
+    )
+    with open(path, "wb") as f:
+        f.write(HEADER.pack(
+            MAGIC, VERSION, 0, height, width, *maze.start, *maze.goal,
+            len(pad_cells), len(special_indices),
+        ))
+        for offset, data in (
+            (pads, pad_cells),
+            (indices, special_indices),
+            (codes, special_codes),
+            (wall_offset, walls),
+        ):
+            f.write(b"\0" * (offset - f.tell()))
+            f.write(data.tobytes())
+
+
+def load_binary(path):
+    """Load a .mazb file into an ArrayMaze."""
+    from array_maze import ArrayMaze
+
+    with MazeFile(path) as maze_file:
+        tiles = maze_file.tiles()
+    return ArrayMaze.from_tiles(tiles)
+
+
+def load_maze(path):
+    # Either format, picked by the file's magic bytes
+    if is_binary(path):
+        return load_binary(path)
+    from maze import Maze
+    return Maze(path)
+
+
+def text_to_binary(text_path, binary_path):
+    from array_maze import ArrayMaze
+    save_binary(ArrayMaze(text_path), binary_path)
+
+
+def binary_to_text(binary_path, text_path, band=1024):
+    # A band of rows at a time, so huge files never get unpacked whole
+    with MazeFile(binary_path) as maze_file, open(text_path, "wb") as f:
+        for top in range(0, maze_file.height, band):
+            bottom = min(top + band, maze_file.height)
+            chars = _CHARS[maze_file.tile_block(top, bottom, 0, maze_file.width)]
+            for row in chars:
+                f.write(row.tobytes())
+                f.write(b"\n")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        sys.exit("usage: python binary_maze.py SOURCE DEST  (.txt <-> .mazb)")
+    source, dest = sys.argv[1:]
+    if is_binary(source):
+        binary_to_text(source, dest)
+    else:
+        text_to_binary(source, dest)
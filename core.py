@@ -1,3 +1,21 @@
+import heapq
+from collections import deque
+from itertools import count
+
+# Tile codes shared by the list-backed Maze and the array-backed ArrayMaze.
+# Any character that isn't listed here is treated as a wall.
+TILE_OPEN = 0
+TILE_WALL = 1
+TILE_START = 2
+TILE_GOAL = 3
+TILE_TELEPORT = 4
+TILE_ENCOURAGE = 5
+TILE_PENALTY = 6
+
+TILE_CHARS = " #ABTNP"
+CHAR_TILES = {char: code for code, char in enumerate(TILE_CHARS)}
+
+
 class Node():
     def __init__(self, state, parent, action):
         self.state = state
@@ -5,34 +23,212 @@ class Node():
         self.action = action
 
 
+class SearchState():
+    """Live state of a running search, shared by every event it yields.
+
+    Events only carry what changed since the previous one; consumers that
+    need the whole picture call snapshot() when they need it.
+    """
+
+    def __init__(self, width, frontier=None):
+        self.width = width
+        # Flat indices of every expanded cell
+        self.expanded = set()
+        self.frontier = frontier
+
+    def explored_cells(self):
+        width = self.width
+        return {divmod(index, width) for index in self.expanded}
+
+    def frontier_cells(self):
+        if self.frontier is None:
+            return []
+        width = self.width
+        return [divmod(index, width) for index in self.frontier.index]
+
+    def snapshot(self):
+        return {"explored": self.explored_cells(), "frontier": self.frontier_cells()}
+
+
+def snapshot(event):
+    return event["search"].snapshot()
+
+
 class StackFrontier():
     def __init__(self):
-        self.frontier = []
+        self.frontier = deque()
+        # state -> node currently queued for it, for O(1) contains_state
+        self.index = {}
 
     def add(self, node):
         self.frontier.append(node)
+        self.index[node.state] = node
 
     def contains_state(self, state):
-        return any(node.state == state for node in self.frontier)
+        return state in self.index
 
     def empty(self):
         return len(self.frontier) == 0
 
+    def __len__(self):
+        return len(self.frontier)
+
+    def _forget(self, node):
+        if self.index.get(node.state) is node:
+            del self.index[node.state]
+
     def remove(self):
         if self.empty():
             raise Exception("empty frontier")
         else:
-            node = self.frontier[-1]
-            self.frontier = self.frontier[:-1]
+            node = self.frontier.pop()
+            self._forget(node)
             return node
 
 
 class QueueFrontier(StackFrontier):
 
+    def add_front(self, node):
+        self.frontier.appendleft(node)
+        self.index[node.state] = node
+
     def remove(self):
         if self.empty():
             raise Exception("empty frontier")
         else:
-            node = self.frontier[0]
-            self.frontier = self.frontier[1:]
-            return node
\ No newline at end of file
+            node = self.frontier.popleft()
+            self._forget(node)
+            return node
+
+
+class PriorityFrontier():
+    """Binary heap keyed by priority with a state -> entry index.
+
+    Re-adding a queued state with a new priority retires the old heap entry
+    instead of leaving a duplicate to be popped and skipped later.
+    """
+
+    def __init__(self):
+        self.frontier = []
+        self.index = {}
+        self.counter = count()
+
+    def add(self, node, priority):
+        entry = self.index.get(node.state)
+        if entry is not None:
+            entry[2] = None
+        entry = [priority, next(self.counter), node]
+        self.index[node.state] = entry
+        heapq.heappush(self.frontier, entry)
+
+    def contains_state(self, state):
+        return state in self.index
+
+    def priority(self, state):
+        return self.index[state][0]
+
+    def empty(self):
+        return len(self.index) == 0
+
+    def __len__(self):
+        return len(self.index)
+
+    def min_priority(self):
+        # Drop retired entries sitting on top of the heap first
+        while self.frontier and self.frontier[0][2] is None:
+            heapq.heappop(self.frontier)
+        return self.frontier[0][0] if self.frontier else float("inf")
+
+    def remove(self):
+        while self.frontier:
+            priority, _, node = heapq.heappop(self.frontier)
+            if node is not None:
+                del self.index[node.state]
+                return node
+        raise Exception("empty frontier")
+
+
+class BucketFrontier():
+    """Bucket queue (Dial's algorithm) for small, evenly spaced priorities.
+
+    Drop-in for PriorityFrontier when every priority times scale is a whole
+    number: each of those numbers gets a FIFO bucket, so add and remove are
+    O(1) amortized and ties pop in the same order as with the heap. A
+    priority below the current bucket just moves the cursor back. Buckets
+    live in a dict and are dropped once the cursor passes them, so memory
+    follows the frontier, not the largest priority seen.
+    """
+
+    def __init__(self, scale=1):
+        self.scale = scale
+        # bucket number -> deque of nodes, none below the cursor
+        self.buckets = {}
+        self.cursor = 0
+        # The cursor's bucket, None if it has none yet
+        self.current = None
+        # state -> node queued for it; nodes left in a bucket that aren't in
+        # here anymore were re-added or popped and get skipped
+        self.index = {}
+
+    def add(self, node, priority):
+        scaled = priority * self.scale
+        bucket = int(scaled)
+        if bucket != scaled:
+            raise Exception(f"priority {priority} is not a multiple of 1/{self.scale}")
+        node.priority = priority
+        self.index[node.state] = node
+
+        nodes = self.buckets.get(bucket)
+        if nodes is None:
+            nodes = self.buckets[bucket] = deque()
+            if bucket <= self.cursor:
+                self.cursor = bucket
+                self.current = nodes
+        nodes.append(node)
+
+    def contains_state(self, state):
+        return state in self.index
+
+    def priority(self, state):
+        return self.index[state].priority
+
+    def empty(self):
+        return len(self.index) == 0
+
+    def __len__(self):
+        return len(self.index)
+
+    def _advance(self):
+        # Drop the cursor's bucket and move on to the next one
+        if self.current is not None:
+            del self.buckets[self.cursor]
+        self.cursor += 1
+        self.current = self.buckets.get(self.cursor)
+
+    def min_priority(self):
+        index = self.index
+        if not index:
+            return float("inf")
+        while True:
+            bucket = self.current
+            # Drop stale nodes on the way to the first live one
+            while bucket:
+                node = bucket[0]
+                if index.get(node.state) is node:
+                    return node.priority
+                bucket.popleft()
+            self._advance()
+
+    def remove(self):
+        index = self.index
+        if not index:
+            raise Exception("empty frontier")
+        # Something is queued, so a live node is at or past the cursor
+        while True:
+            bucket = self.current
+            while bucket:
+                node = bucket.popleft()
+                if index.get(node.state) is node:
+                    del index[node.state]
+                    return node
+            self._advance()
@@ -0,0 +1,146 @@
+# dead_ends.py
+#
+# Dead-end filling over flat cell indices. Every open cell (T, N and P
+# included) starts with its degree in the adjacency table, teleport edge
+# counted, and cells with at most one way out are filled, decrementing
+# their neighbors' degrees until nothing but start, goal and the corridors
+# (and loops) between them is left.
+import numpy as np
+
+from array_maze import ArrayMaze
+from core import TILE_WALL, TILE_OPEN
+
+# Waves at most this wide are filled cell by cell instead of as arrays
+NARROW_WAVE = 64
+
+
+class DeadEnds:
+    """Result of filling one maze: which cells went, in what order."""
+
+    def __init__(self, width, height, order, filled):
+        self.width = width
+        self.height = height
+        # Flat indices in fill order, and a flat bool mask of the same cells
+        self.order = order
+        self.filled = filled
+
+    def __len__(self):
+        return len(self.order)
+
+
+def fill_dead_ends(maze):
+    """Fill every dead end of maze, leaving start and goal alone.
+
+    Large waves of dead ends (the first one, open rooms) are removed as
+    arrays, their neighbors' degrees dropping by one np.unique count per
+    wave. Once a wave is down to a few corridor tips, the rest is walked
+    with a plain queue, since those corridors can be very long.
+    """
+    adjacency = maze.adjacency()
+    offsets = np.asarray(adjacency.offsets, dtype=np.int64)
+    targets = np.asarray(adjacency.targets, dtype=np.int64)
+    n = maze.width * maze.height
+
+    open_cells = np.frombuffer(maze.tile_codes(), dtype=np.uint8) != TILE_WALL
+    degree = np.diff(offsets).astype(np.int32)
+    keep = np.zeros(n, dtype=bool)
+    keep[[maze.index(maze.start), maze.index(maze.goal)]] = True
+    filled = np.zeros(n, dtype=bool)
+    order = []
+
+    wave = np.flatnonzero(open_cells & (degree <= 1) & ~keep)
+    while len(wave) > NARROW_WAVE:
+        filled[wave] = True
+        order.append(wave)
+        # Every CSR edge out of the wave, then drop the ones into filled cells
+        starts = offsets[wave]
+        counts = offsets[wave + 1] - starts
+        edges = np.repeat(starts - np.cumsum(counts) + counts, counts) + np.arange(counts.sum())
+        neighbors = targets[edges]
+        neighbors = neighbors[~filled[neighbors]]
+        touched, counts = np.unique(neighbors, return_counts=True)
+        degree[touched] -= counts.astype(np.int32)
+        wave = touched[(degree[touched] <= 1) & ~keep[touched]]
+
+    # Narrow tail: memoryviews keep the per-cell reads cheap
+    offsets_view = memoryview(offsets)
+    targets_view = memoryview(targets)
+    degree_view = memoryview(degree)
+    filled_view = memoryview(filled)
+    keep_view = memoryview(keep)
+    queue = wave.tolist()
+    for cell in queue:
+        filled_view[cell] = True
+    tail = []
+    while queue:
+        cell = queue.pop()
+        tail.append(cell)
+        for k in range(offsets_view[cell], offsets_view[cell + 1]):
+            neighbor = targets_view[k]
+            if filled_view[neighbor]:
+                continue
+            degree_view[neighbor] -= 1
+            if degree_view[neighbor] <= 1 and not keep_view[neighbor]:
+                filled_view[neighbor] = True
+                queue.append(neighbor)
+    order.append(np.array(tail, dtype=np.int64))
+
+    return DeadEnds(maze.width, maze.height, np.concatenate(order), filled)
+
+
+def dead_ends(maze):
+    # Cached on the maze, so solve() and reduce_maze() share one fill
+    return maze.cached("dead_ends", fill_dead_ends)
+
+
+def corridor_path(maze, result=None):
+    """Path from start to goal through the cells that weren't filled.
+
+    Same shape as the solvers' paths. In a perfect maze what's left is the
+    solution corridor itself; where loops survive, this is the fewest-moves
+    route through them. None if start and goal aren't connected.
+    """
+    result = result or dead_ends(maze)
+    adjacency = maze.adjacency()
+    offsets, targets = adjacency.offsets, adjacency.targets
+    filled = memoryview(result.filled)
+    start = maze.index(maze.start)
+    goal = maze.index(maze.goal)
+
+    parents = {start: -1}
+    queue = [start]
+    for cell in queue:
+        if cell == goal:
+            break
+        for k in range(offsets[cell], offsets[cell + 1]):
+            neighbor = targets[k]
+            if neighbor not in parents and not filled[neighbor]:
+                parents[neighbor] = cell
+                queue.append(neighbor)
+
+    if goal not in parents:
+        return None
+    cells = []
+    cell = goal
+    while cell != start:
+        cells.append(divmod(cell, maze.width))
+        cell = parents[cell]
+    cells.reverse()
+    return cells
+
+
+def reduce_maze(maze, result=None):
+    """ArrayMaze copy of maze with every filled cell turned into wall.
+
+    Start, goal and every path between them survive unchanged, so any
+    solver can run on the smaller maze and its path is valid on the
+    original. A pad whose partner was filled loses its teleport with it,
+    so the remaining pads keep their reading-order pairs.
+    """
+    result = result or dead_ends(maze)
+    tiles = np.frombuffer(maze.tile_codes(), dtype=np.uint8).copy()
+    for pad, partner in maze.adjacency().teleports.items():
+        if result.filled[partner] and not result.filled[pad]:
+            tiles[pad] = TILE_OPEN
+    tiles[result.filled] = TILE_WALL
+    return ArrayMaze.from_tiles(tiles.reshape(maze.height, maze.width))
@@ -0,0 +1,64 @@
+# goal_field.py
+import heapq
+from array import array
+
+from algorithms import ASTAR_COSTS
+
+
+class GoalField:
+    """Cost-to-go and next step toward maze.goal for every cell.
+
+    Built once by a reverse Dijkstra from the goal with astar's step costs,
+    so a path from any start is just a walk along next_step.
+    """
+
+    def __init__(self, width, goal, cost, next_step):
+        self.width = width
+        self.goal = goal
+        # Flat arrays: cost[i] to reach the goal from i, next_step[i] the cell to move to
+        self.cost = cost
+        self.next_step = next_step
+
+    def cost_to_go(self, state):
+        cost = self.cost[state[0] * self.width + state[1]]
+        return None if cost == float("inf") else cost
+
+    def path_from(self, start):
+        # Same shape as the solvers' paths: cells after start, ending at the goal
+        index = start[0] * self.width + start[1]
+        if self.cost[index] == float("inf"):
+            return None
+        cells = []
+        while index != self.goal:
+            index = self.next_step[index]
+            cells.append(divmod(index, self.width))
+        return cells
+
+
+def build_goal_field(maze):
+    adjacency = maze.adjacency()
+    offsets, targets = adjacency.offsets, adjacency.targets
+    tiles = maze.tile_codes()
+    n = maze.width * maze.height
+    goal = maze.index(maze.goal)
+
+    cost = array("d", [float("inf")]) * n
+    next_step = array("i", [-1]) * n
+    cost[goal] = 0
+
+    # Edges are symmetric, so relaxing u's neighbors v means "v steps into u",
+    # which costs whatever entering u costs
+    queue = [(0, goal)]
+    while queue:
+        distance, u = heapq.heappop(queue)
+        if distance > cost[u]:
+            continue
+        candidate = distance + ASTAR_COSTS[tiles[u]]
+        for k in range(offsets[u], offsets[u + 1]):
+            v = targets[k]
+            if candidate < cost[v]:
+                cost[v] = candidate
+                next_step[v] = u
+                heapq.heappush(queue, (candidate, v))
+
+    return GoalField(maze.width, goal, cost, next_step)
@@ -0,0 +1,97 @@
+# landmarks.py
+import heapq
+from array import array
+
+import numpy as np
+
+from algorithms import ASTAR_COSTS
+
+# Landmarks picked per maze, each costs one full Dijkstra to build
+DEFAULT_LANDMARKS = 4
+
+
+class Landmarks:
+    """Exact astar-cost distances from a few landmark cells to every cell.
+
+    Paths pay the cost of every cell they enter, teleport hops included, so
+    distance to a landmark follows from distance from it:
+    d(v, L) = d(L, v) - cost(v) + cost(L). The triangle inequality then
+    bounds d(v, t) from below by d(L, t) - d(L, v) and d(v, L) - d(t, L),
+    and the best of those over all landmarks is a consistent heuristic that
+    already knows every teleport shortcut.
+    """
+
+    def __init__(self, width, cells, distances, costs):
+        self.width = width
+        # Flat indices of the landmarks, and (landmarks, cells) distances from them
+        self.cells = cells
+        self.distances = distances
+        self.costs = costs
+
+    def __len__(self):
+        return len(self.cells)
+
+    def lower_bounds(self, target):
+        """Flat float64 array of lower bounds on the cost from each cell to target."""
+        from_landmark = self.distances
+        # d(v, L) for every landmark L and cell v
+        to_landmark = from_landmark - self.costs + self.costs[self.cells][:, None]
+
+        bounds = np.zeros(from_landmark.shape[1])
+        with np.errstate(invalid="ignore"):
+            # inf - inf (both unreachable from a landmark) says nothing and
+            # comes out nan, which fmax skips
+            for forward, backward in zip(from_landmark, to_landmark):
+                np.fmax(bounds, forward[target] - forward, out=bounds)
+                np.fmax(bounds, backward - backward[target], out=bounds)
+        return bounds
+
+    def heuristic(self, target):
+        # Plain list, indexing it is the cheapest lookup in the solver loop
+        return self.lower_bounds(target).tolist()
+
+
+def _distances_from(maze, source):
+    # Dijkstra with astar's cost model: stepping into v costs ASTAR_COSTS[v]
+    adjacency = maze.adjacency()
+    offsets, targets = adjacency.offsets, adjacency.targets
+    tiles = maze.tile_codes()
+    cost = array("d", [float("inf")]) * (maze.width * maze.height)
+    cost[source] = 0
+
+    queue = [(0, source)]
+    while queue:
+        distance, u = heapq.heappop(queue)
+        if distance > cost[u]:
+            continue
+        for k in range(offsets[u], offsets[u + 1]):
+            v = targets[k]
+            candidate = distance + ASTAR_COSTS[tiles[v]]
+            if candidate < cost[v]:
+                cost[v] = candidate
+                heapq.heappush(queue, (candidate, v))
+    return np.frombuffer(cost, dtype=np.float64)
+
+
+def build_landmarks(maze, count=DEFAULT_LANDMARKS):
+    """Pick count landmarks by farthest-point selection and measure from them.
+
+    The first is the cell farthest from the start, each next one the cell
+    farthest from all landmarks so far, so they spread to the maze's edges,
+    where they give the tightest bounds. Only cells reachable from the start
+    are candidates.
+    """
+    costs = np.array(ASTAR_COSTS, dtype=np.float64)[np.frombuffer(maze.tile_codes(), dtype=np.uint8)]
+    spread = _distances_from(maze, maze.index(maze.start))
+    reachable = np.isfinite(spread)
+
+    cells, distances = [], []
+    for _ in range(count):
+        candidate = int(np.argmax(np.where(reachable, spread, -1)))
+        if candidate in cells:
+            break
+        cells.append(candidate)
+        distances.append(_distances_from(maze, candidate))
+        spread = distances[-1] if len(cells) == 1 else np.minimum(spread, distances[-1])
+
+    return Landmarks(maze.width, np.array(cells, dtype=np.int64), np.array(distances), costs)
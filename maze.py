@@ -1,6 +1,9 @@
 import os
+from adjacency import ACTIONS, build_adjacency
 from algorithms import bfs, dfs
-from core import Node
+from core import Node, CHAR_TILES, TILE_WALL
+from goal_field import build_goal_field
+from landmarks import build_landmarks
 
 class Maze:
     def __init__(self, filename):
@@ -65,45 +68,110 @@ class Maze:
                         wall_row.append(True)
                 except IndexError:
                     wall_row.append(False)
-
-            self.teleports = {}
-            for i in range(0, len(self.teleport_locations), 2):
-                if i + 1 < len(self.teleport_locations):
-                    a = self.teleport_locations[i]
-                    b = self.teleport_locations[i + 1]
-                    self.teleports[a] = b
-                    self.teleports[b] = a
             self.walls.append(wall_row)
 
+        self._pair_teleports()
 
         self.solution = None
         self.explored = set()
 
+        # Derived structures (adjacency, tile codes, ...), dropped on every edit
+        self.version = 0
+        self._cache = {}
+
+    def _pair_teleports(self):
+        # Teleport pads are paired in reading order
+        self.teleports = {}
+        for i in range(0, len(self.teleport_locations) - 1, 2):
+            a = self.teleport_locations[i]
+            b = self.teleport_locations[i + 1]
+            self.teleports[a] = b
+            self.teleports[b] = a
+
+    def cached(self, key, build):
+        if key not in self._cache:
+            self._cache[key] = build(self)
+        return self._cache[key]
+
+    def invalidate(self):
+        self.version += 1
+        self._cache.clear()
+
+    def adjacency(self):
+        return self.cached("adjacency", build_adjacency)
+
+    def goal_field(self):
+        # Shared by every start cell until the maze is edited
+        return self.cached("goal_field", build_goal_field)
+
+    def landmarks(self):
+        # ALT distances, built once and kept until the maze is edited
+        return self.cached("landmarks", build_landmarks)
+
+    def tile_codes(self):
+        # Flat bytearray of tile codes, indexed like adjacency()
+        def build(maze):
+            codes = bytearray(maze.width * maze.height)
+            for i, row in enumerate(maze.grid):
+                base = i * maze.width
+                for j, char in enumerate(row):
+                    codes[base + j] = CHAR_TILES.get(char, TILE_WALL)
+            return codes
+        return self.cached("tile_codes", build)
+
+    def set_tile(self, state, char):
+        i, j = state
+        _check_endpoints(self, state, char)
+        row = self.grid[i]
+        if j >= len(row):
+            row.extend(" " * (j + 1 - len(row)))
+        previous = row[j]
+        row[j] = char
+
+        self.walls[i][j] = CHAR_TILES.get(char, TILE_WALL) == TILE_WALL
+        self.encouragements.discard(state)
+        self.penalties.discard(state)
+        if previous == "T":
+            self.teleport_locations.remove(state)
+
+        if char == "A":
+            previous_start, self.start = self.start, state
+            if previous_start and previous_start != state:
+                self.set_tile(previous_start, " ")
+        elif char == "B":
+            previous_goal, self.goal = self.goal, state
+            if previous_goal and previous_goal != state:
+                self.set_tile(previous_goal, " ")
+        elif char == "T":
+            self.teleport_locations.append(state)
+            self.teleport_locations.sort()
+        elif char == "N":
+            self.encouragements.add(state)
+        elif char == "P":
+            self.penalties.add(state)
+
+        if previous == "T" or char == "T":
+            self._pair_teleports()
+        self.invalidate()
+
+    def set_wall(self, state, wall=True):
+        self.set_tile(state, "#" if wall else " ")
+
+    # Flat addressing: cell (r, c) lives at r * width + c
+    def index(self, state):
+        return state[0] * self.width + state[1]
+
+    def state_of(self, index):
+        return divmod(index, self.width)
+
     def neighbors(self, state):
-        row, col = state
-        candidates = [
-            ("up", (row - 1, col)),
-            ("down", (row + 1, col)),
-            ("left", (row, col - 1)),
-            ("right", (row, col + 1))
+        adjacency = self.adjacency()
+        index = self.index(state)
+        return [
+            (ACTIONS[action], divmod(target, self.width))
+            for action, target in adjacency.edges(index)
         ]
 
-        result = []
-
-        # Regular neighbors
-        for action, (r, c) in candidates:
-            if 0 <= r < self.height and 0 <= c < self.width and not self.walls[r][c]:
-                result.append((action, (r, c)))
-
-        # Handle teleport tiles
-        if state in self.teleports:
-            for t in self.teleports:
-                if t != state:
-                    result.append(("teleport", t))
-
-        return result
-
-
     def solve(self, method):
         if method == "dfs":
             generator = dfs(self)
@@ -112,13 +180,15 @@ class Maze:
         else:
             raise Exception("Unknown solving method.")
 
+        # Events only carry the newly expanded cells, so grow explored in place
+        self.explored = set()
         final_result = None
         for step in generator:
             if step["status"] == "done":
                 final_result = step
                 break
             else:
-                self.explored = step.get("explored", set())
+                self.explored.update(step.get("expanded", ()))
                 yield step
 
         if final_result:
@@ -165,43 +235,24 @@ class Maze:
             return 2
 
 
-    def output_image(self, filename="maze.png", show_solution=True, show_explored=False):
-        from PIL import Image, ImageDraw
+    def output_image(self, filename="maze.png", show_solution=True, show_explored=False,
+                     cell_size=50, cell_border=None, streamed=None):
+        # streamed=None streams only images too big to build in memory
+        import maze_image
 
-        cell_size = 50
-        cell_border = 2
         os.makedirs(self.filepath, exist_ok=True)
         full_path = self._get_unique_filename(filename)
 
-        img = Image.new("RGBA", (self.width * cell_size, self.height * cell_size), "black")
-        draw = ImageDraw.Draw(img)
-
-        solution = self.solution[1] if self.solution else None
-
-        for i, row in enumerate(self.walls):
-            for j, col in enumerate(row):
-                if col:
-                    fill = (40, 40, 40)
-                elif (i, j) == self.start:
-                    fill = (255, 0, 0)
-                elif (i, j) == self.goal:
-                    fill = (0, 171, 28)
-                elif solution and show_solution and (i, j) in solution:
-                    fill = (220, 235, 113)
-                elif show_explored and (i, j) in self.explored:
-                    fill = (212, 97, 85)
-                else:
-                    fill = (237, 240, 252)
-
-                draw.rectangle(
-                    [
-                        (j * cell_size + cell_border, i * cell_size + cell_border),
-                        ((j + 1) * cell_size - cell_border, (i + 1) * cell_size - cell_border)
-                    ],
-                    fill=fill
-                )
-
-        img.save(full_path)
+        if streamed is None:
+            streamed = self.width * self.height * cell_size * cell_size > maze_image.STREAM_PIXELS
+        if streamed:
+            maze_image.save_png_streamed(
+                self, full_path, cell_size, cell_border, show_solution, show_explored
+            )
+        else:
+            img = maze_image.render(self, cell_size, cell_border, show_solution, show_explored)
+            img.save(full_path)
+        return full_path
 
     def reset(self):
         self.solution = None
@@ -227,3 +278,10 @@ class Maze:
         return open_neighbors <= 1
 
 
+def _check_endpoints(maze, state, char):
+    # Start and goal can only move (by placing "A"/"B" elsewhere), painting
+    # over them would leave maze.start/maze.goal pointing at the old cell
+    if state == maze.start and char != "A":
+        raise Exception("Can't overwrite the start, place 'A' somewhere else first")
+    if state == maze.goal and char != "B":
+        raise Exception("Can't overwrite the goal, place 'B' somewhere else first")
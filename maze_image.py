@@ -0,0 +1,165 @@
+# maze_image.py
+#
+# Renders a maze to an image with NumPy instead of one ImageDraw call per
+# cell. Every cell gets a palette index (tile code, explored, solution), the
+# index grid is scaled up to pixels with fancy indexing and mapped through
+# the palette in one go.
+#
+# render() builds the whole RGBA image and hands its buffer to PIL without
+# a copy. save_png_streamed() renders a band of cell rows at a time and
+# writes it straight into a PNG with zlib, so the image never has to fit in
+# memory.
+import struct
+import zlib
+from itertools import chain
+
+import numpy as np
+
+from core import TILE_WALL, TILE_START, TILE_GOAL, TILE_CHARS
+
+# Palette indices past the tile codes
+EXPLORED = len(TILE_CHARS)
+SOLUTION = EXPLORED + 1
+BORDER = SOLUTION + 1
+
+# Same colors Maze.output_image always used, special tiles draw as open
+PALETTE = np.zeros((BORDER + 1, 4), dtype=np.uint8)
+PALETTE[:, 3] = 255
+PALETTE[:EXPLORED, :3] = (237, 240, 252)
+PALETTE[TILE_WALL, :3] = (40, 40, 40)
+PALETTE[TILE_START, :3] = (255, 0, 0)
+PALETTE[TILE_GOAL, :3] = (0, 171, 28)
+PALETTE[EXPLORED, :3] = (212, 97, 85)
+PALETTE[SOLUTION, :3] = (220, 235, 113)
+PALETTE[BORDER, :3] = (0, 0, 0)
+
+# One uint32 per color, so mapping a pixel is a single 4-byte gather
+_PALETTE_WORDS = PALETTE.view(np.uint32).reshape(-1)
+
+# Above this many pixels Maze.output_image streams instead of rendering whole
+STREAM_PIXELS = 1 << 26
+
+# Target size of one streamed band of raw pixel rows
+BAND_BYTES = 1 << 24
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+
+def _default_border(cell_size):
+    return 2 if cell_size >= 10 else 0
+
+
+def _cell_array(cells):
+    # (row, col) pairs from a set or list of cells, as two index arrays
+    if not cells:
+        return None
+    pairs = np.fromiter(chain.from_iterable(cells), dtype=np.int64, count=2 * len(cells)).reshape(-1, 2)
+    return pairs[:, 0], pairs[:, 1]
+
+
+def cell_indices(maze, show_solution=True, show_explored=False):
+    """(height, width) uint8 palette index of every cell."""
+    codes = np.frombuffer(maze.tile_codes(), dtype=np.uint8).reshape(maze.height, maze.width)
+    cells = codes.copy()
+
+    # Walls, start and goal keep their own color over explored and solution
+    plain = (codes != TILE_WALL) & (codes != TILE_START) & (codes != TILE_GOAL)
+    layers = []
+    if show_explored:
+        layers.append((maze.explored, EXPLORED))
+    if show_solution:
+        layers.append((solution_cells(maze), SOLUTION))
+    for marked, index in layers:
+        pairs = _cell_array(marked)
+        if pairs is None:
+            continue
+        mask = np.zeros_like(plain)
+        mask[pairs] = True
+        cells[mask & plain] = index
+    return cells
+
+
+def solution_cells(maze):
+    # Maze.solution is the solver's path, older code kept (actions, cells)
+    solution = maze.solution
+    if isinstance(solution, tuple) and len(solution) == 2 and isinstance(solution[1], list):
+        return solution[1]
+    return solution or ()
+
+
+def _scale(cells, cell_size, cell_border):
+    # Palette indices of every pixel of a band of cell rows. A cell covers
+    # pixels [border, cell_size - border] of its square, like the old
+    # inclusive ImageDraw rectangles, the rest is BORDER.
+    offsets = np.arange(cell_size)
+    inside = (offsets >= cell_border) & (offsets <= cell_size - cell_border)
+    rows, cols = cells.shape
+
+    pixels = cells[:, np.arange(cols * cell_size) // cell_size]
+    pixels[:, ~np.tile(inside, cols)] = BORDER
+    pixels = pixels[np.arange(rows).repeat(cell_size)]
+    pixels[~np.tile(inside, rows)] = BORDER
+    return pixels
+
+
+def render(maze, cell_size=50, cell_border=None, show_solution=True, show_explored=False):
+    """The maze as an RGBA PIL image, cell_size pixels per cell (1 and up)."""
+    from PIL import Image
+
+    if cell_border is None:
+        cell_border = _default_border(cell_size)
+    cells = cell_indices(maze, show_solution, show_explored)
+    pixels = _PALETTE_WORDS[_scale(cells, cell_size, cell_border)]
+
+    # RGBA is one of the modes PIL maps instead of copying, and the image
+    # keeps the array alive
+    height, width = pixels.shape
+    return Image.frombuffer("RGBA", (width, height), pixels, "raw", "RGBA", 0, 1)
+
+
+def _chunk(kind, data):
+    return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+
+
+def write_png(f, width, height, palette, bands, level=6):
+    """Write an 8-bit palette PNG to an open binary file.
+
+    palette is a (colors, 3) uint8 array and bands yields (rows, width)
+    uint8 arrays of palette indices, top to bottom. Each band is compressed
+    and written before the next one is asked for.
+    """
+    f.write(PNG_SIGNATURE)
+    f.write(_chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 3, 0, 0, 0)))
+    f.write(_chunk(b"PLTE", np.ascontiguousarray(palette, dtype=np.uint8).tobytes()))
+    compressor = zlib.compressobj(level)
+    for band in bands:
+        # Every scanline starts with its filter type, 0 = none
+        raw = np.zeros((band.shape[0], width + 1), dtype=np.uint8)
+        raw[:, 1:] = band
+        data = compressor.compress(raw.data)
+        if data:
+            f.write(_chunk(b"IDAT", data))
+    f.write(_chunk(b"IDAT", compressor.flush()))
+    f.write(_chunk(b"IEND", b""))
+
+
+def save_png_streamed(maze, filename, cell_size=50, cell_border=None,
+                      show_solution=True, show_explored=False, level=6):
+    """Write the maze to a PNG one band of cell rows at a time.
+
+    Only one band of pixels (about BAND_BYTES) is held at once, so this
+    works for images far bigger than memory. The file is a palette PNG,
+    one byte per pixel, with the same colors render() uses.
+    """
+    if cell_border is None:
+        cell_border = _default_border(cell_size)
+    cells = cell_indices(maze, show_solution, show_explored)
+    width = maze.width * cell_size
+    band_rows = max(1, BAND_BYTES // (width * cell_size))
+
+    def bands():
+        for top in range(0, maze.height, band_rows):
+            yield _scale(cells[top:top + band_rows], cell_size, cell_border)
+
+    with open(filename, "wb") as f:
+        write_png(f, width, maze.height * cell_size, PALETTE[:, :3], bands(), level)
@@ -0,0 +1,273 @@
+# queries.py
+#
+# Many (start, goal) queries against one fixed maze. Queries that share a
+# start are answered by a single Dijkstra that stops once all of their goals
+# are settled, and everything derived from the maze (adjacency, per-cell
+# step costs, landmarks) is built once and shared by every query.
+#
+#   results = solve_many(maze, [((1, 1), (9, 9)), ((1, 1), (5, 3)), ...])
+#   results.costs[0], results.path(0)
+import heapq
+import os
+import time
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from algorithms import ASTAR_COSTS
+from core import TILE_WALL
+
+INF = float("inf")
+
+# Groups with at most this many goals run A* on the landmark bounds when
+# bound="alt", bigger ones plain Dijkstra
+ALT_MAX_TARGETS = 8
+
+
+def step_costs(maze):
+    # astar's cost of stepping into each cell, flat and cached on the maze
+    def build(maze):
+        return array("d", (ASTAR_COSTS[code] for code in maze.tile_codes()))
+    return maze.cached("step_costs", build)
+
+
+class QueryResults:
+    """Compact answers to a batch of queries, in query order.
+
+    costs is a float64 array (inf where the goal can't be reached) and,
+    when paths were kept, every path is a run of flat cell indices in one
+    int32 array, path i being cells[offsets[i]:offsets[i + 1]].
+    """
+
+    def __init__(self, width, costs, offsets=None, cells=None, expanded=0, duration=0.0):
+        self.width = width
+        self.costs = costs
+        self.offsets = offsets
+        self.cells = cells
+        self.expanded = expanded
+        self.duration = duration
+
+    def __len__(self):
+        return len(self.costs)
+
+    def found(self):
+        return np.isfinite(self.costs)
+
+    def path_length(self, i):
+        return int(self.offsets[i + 1] - self.offsets[i])
+
+    def path(self, i):
+        """Path of query i like a solver's: cells after the start, ending at the goal."""
+        if self.cells is None:
+            raise Exception("paths weren't kept, pass paths=True")
+        if not np.isfinite(self.costs[i]):
+            return None
+        run = self.cells[self.offsets[i]:self.offsets[i + 1]]
+        return [divmod(index, self.width) for index in run.tolist()]
+
+
+def _as_pairs(maze, pairs):
+    # (k, 4) array of rows/cols, or ((r, c), (r, c)) pairs, to flat indices
+    pairs = np.asarray(pairs, dtype=np.int64).reshape(-1, 4)
+    for name, (rows, cols) in (("start", (pairs[:, 0], pairs[:, 1])), ("goal", (pairs[:, 2], pairs[:, 3]))):
+        if len(pairs) and (rows.min() < 0 or rows.max() >= maze.height or cols.min() < 0 or cols.max() >= maze.width):
+            raise Exception(f"query {name} outside the maze")
+    return pairs[:, 0] * maze.width + pairs[:, 1], pairs[:, 2] * maze.width + pairs[:, 3]
+
+
+def _group(starts, goals, queries):
+    # source -> (query numbers, their goals) for the given queries, in order
+    # of first appearance
+    order = queries[np.argsort(starts[queries], kind="stable")]
+    sources, first = np.unique(starts[order], return_index=True)
+    groups = []
+    for source, queries in zip(sources.tolist(), np.split(order, first[1:])):
+        groups.append((source, queries, goals[queries]))
+    groups.sort(key=lambda group: group[1][0])
+    return groups
+
+
+class _Scratch:
+    """Per-cell search buffers, allocated once per process and maze size.
+
+    Each search only resets the cells it touched, so a batch with many
+    sources doesn't pay O(n) per group before searching.
+    """
+
+    def __init__(self, n):
+        self.n = n
+        self.dist = array("d", [INF]) * n
+        # Only read along paths this search set, so it's never reset
+        self.parent = array("i", [-1]) * n
+        self.closed = bytearray(n)
+
+
+_scratch = None
+
+
+def _scratch_for(n):
+    global _scratch
+    if _scratch is None or _scratch.n != n:
+        _scratch = _Scratch(n)
+    return _scratch
+
+
+def _search(maze, source, targets, bounds, paths):
+    # Dijkstra (A* when bounds is given) from source until every target is
+    # settled; returns {target: cost}, {target: flat path} and expansions
+    adjacency = maze.adjacency()
+    offsets, adjacent = adjacency.offsets, adjacency.targets
+    costs = step_costs(maze)
+    scratch = _scratch_for(maze.width * maze.height)
+
+    dist, parent, closed = scratch.dist, scratch.parent, scratch.closed
+    dist[source] = 0
+    # Every cell with a finite dist ends up here or still in the queue
+    settled = []
+    remaining = set(targets)
+    queue = [(bounds[source] if bounds is not None else 0, source)]
+    expanded = 0
+
+    while queue and remaining:
+        _, u = heapq.heappop(queue)
+        if closed[u]:
+            continue
+        closed[u] = 1
+        settled.append(u)
+        expanded += 1
+        remaining.discard(u)
+        base = dist[u]
+        for k in range(offsets[u], offsets[u + 1]):
+            v = adjacent[k]
+            if closed[v]:
+                continue
+            candidate = base + costs[v]
+            if candidate < dist[v]:
+                dist[v] = candidate
+                if paths:
+                    parent[v] = u
+                heapq.heappush(queue, (candidate + bounds[v] if bounds is not None else candidate, v))
+
+    found = {target: dist[target] for target in set(targets)}
+    walked = {}
+    if paths:
+        for target, cost in found.items():
+            if cost == INF:
+                continue
+            cells = []
+            index = target
+            while index != source:
+                cells.append(index)
+                index = parent[index]
+            cells.reverse()
+            walked[target] = cells
+
+    for index in settled:
+        dist[index] = INF
+        closed[index] = 0
+    for _, index in queue:
+        dist[index] = INF
+    return found, walked, expanded
+
+
+def _bounds(maze, targets, bound):
+    if bound is None or len(set(targets)) > ALT_MAX_TARGETS:
+        return None
+    # The smallest bound over the targets stays consistent
+    landmarks = maze.landmarks()
+    bounds = None
+    for target in set(targets):
+        lower = landmarks.lower_bounds(target)
+        bounds = lower if bounds is None else np.minimum(bounds, lower)
+    # Indexing a memoryview gives plain floats without an n-sized list
+    return memoryview(bounds)
+
+
+def _solve_groups(maze, groups, bound, paths):
+    # Answers for a list of groups as arrays, cheap to send back from a
+    # worker: query numbers, costs, path lengths and the paths end to end
+    answers = []
+    expanded = 0
+    for source, queries, targets in groups:
+        targets = targets.tolist()
+        found, walked, count = _search(maze, source, targets, _bounds(maze, targets, bound), paths)
+        expanded += count
+        costs = np.array([found[target] for target in targets])
+        runs = [walked.get(target, ()) for target in targets]
+        lengths = np.array([len(run) for run in runs], dtype=np.int64)
+        cells = np.fromiter((index for run in runs for index in run), dtype=np.int32, count=int(lengths.sum()))
+        answers.append((queries, costs, lengths, cells))
+    return answers, expanded
+
+
+# Worker processes get the maze once, through the pool initializer
+_worker_maze = None
+
+
+def _init_worker(maze):
+    global _worker_maze
+    _worker_maze = maze
+
+
+def _worker_solve(groups, bound, paths):
+    return _solve_groups(_worker_maze, groups, bound, paths)
+
+
+def solve_many(maze, pairs, bound=None, paths=True, workers=None):
+    """Answer a batch of (start, goal) queries with astar's step costs.
+
+    pairs is a (k, 4) array of start row, start col, goal row, goal col,
+    or a list of ((r, c), (r, c)) pairs. bound="alt" steers groups with
+    few goals with the maze's cached landmarks. paths=False keeps only the
+    costs. workers > 1 spreads the groups over that many processes.
+    Queries that start or end on a wall cost inf without being searched.
+
+    Doesn't touch maze.start, maze.goal, maze.solution or maze.explored.
+    """
+    if bound not in (None, "alt"):
+        raise Exception(f"Unknown bound: {bound}")
+    start_time = time.perf_counter()
+    starts, goals = _as_pairs(maze, pairs)
+    # A wall goal is never settled, so its group would flood everything
+    # reachable before giving up; wall starts and goals are unreachable
+    tiles = np.frombuffer(maze.tile_codes(), dtype=np.uint8)
+    open_queries = np.flatnonzero((tiles[starts] != TILE_WALL) & (tiles[goals] != TILE_WALL))
+    groups = _group(starts, goals, open_queries)
+
+    # Build the shared structures up front so workers inherit them
+    maze.adjacency()
+    step_costs(maze)
+    if bound is not None:
+        maze.landmarks()
+
+    if workers and workers > 1 and len(groups) > 1:
+        chunks = [groups[i::workers * 4] for i in range(min(len(groups), workers * 4))]
+        with ProcessPoolExecutor(
+            max_workers=min(workers, os.cpu_count() or 1),
+            initializer=_init_worker, initargs=(maze,),
+        ) as pool:
+            parts = list(pool.map(_worker_solve, chunks, [bound] * len(chunks), [paths] * len(chunks)))
+    else:
+        parts = [_solve_groups(maze, groups, bound, paths)]
+
+    answers = [answer for group_answers, _ in parts for answer in group_answers]
+    expanded = sum(count for _, count in parts)
+    costs = np.full(len(starts), INF)
+    lengths = np.zeros(len(starts), dtype=np.int64)
+    for queries, group_costs, group_lengths, _ in answers:
+        costs[queries] = group_costs
+        lengths[queries] = group_lengths
+
+    offsets = cells = None
+    if paths:
+        # Move every group's paths into query order
+        offsets = np.zeros(len(starts) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+        cells = np.empty(offsets[-1], dtype=np.int32)
+        for queries, _, group_lengths, group_cells in answers:
+            position = 0
+            for query, length in zip(queries.tolist(), group_lengths.tolist()):
+                cells[offsets[query]:offsets[query] + length] = group_cells[position:position + length]
+                position += length
+    return QueryResults(maze.width, costs, offsets, cells, expanded, time.perf_counter() - start_time)
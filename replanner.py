@@ -0,0 +1,277 @@
+# replanner.py
+#
+# Incremental replanning for mazes that are edited while they're being
+# solved, with Lifelong Planning A* (LPA*). g and rhs values survive between
+# plans, so after an edit only the cells whose cost-from-start actually
+# changed are searched again.
+#
+#   planner = Replanner(maze)
+#   planner.plan()["path"]
+#   planner.apply([((3, 4), "#"), ((5, 1), " ")])
+#   planner.move_goal((9, 9))
+#   planner.plan()["path"]
+import heapq
+import time
+from array import array
+
+import numpy as np
+
+from algorithms import ASTAR_COSTS, _relaxed_distance
+from core import CHAR_TILES, TILE_WALL, TILE_OPEN
+
+INF = float("inf")
+
+# Up to this many pads the heuristic routes through each pad exactly, past
+# it through the nearest pad with the cheapest pad-to-goal distance
+EXACT_PADS = 32
+
+
+def _nearest_distance(height, width, seeds):
+    # Manhattan distance from every cell to the nearest seed, ignoring
+    # walls: two sweeps along the rows, then two along the columns
+    distance = np.full((height, width), INF)
+    rows, cols = np.divmod(np.asarray(seeds, dtype=np.int64), width)
+    distance[rows, cols] = 0
+    for c in range(1, width):
+        np.minimum(distance[:, c], distance[:, c - 1] + 1, out=distance[:, c])
+    for c in range(width - 2, -1, -1):
+        np.minimum(distance[:, c], distance[:, c + 1] + 1, out=distance[:, c])
+    for r in range(1, height):
+        np.minimum(distance[r], distance[r - 1] + 1, out=distance[r])
+    for r in range(height - 2, -1, -1):
+        np.minimum(distance[r], distance[r + 1] + 1, out=distance[r])
+    return distance
+
+
+def heuristic_table(maze, goal, teleports, min_cost):
+    """Flat array('d') lower bound on the cost from every cell to goal.
+
+    Manhattan distance where teleport hops are free, as in
+    algorithms._relaxed_distance, scaled by the cheapest step. Consistent,
+    so LPA* never has to expand a cell twice for one plan.
+    """
+    height, width = maze.height, maze.width
+    gr, gc = divmod(goal, width)
+    rows = np.abs(np.arange(height) - gr)[:, None]
+    cols = np.abs(np.arange(width) - gc)[None, :]
+    bound = (rows + cols).astype(np.float64)
+
+    if teleports:
+        estimate = _relaxed_distance(maze, (gr, gc))
+        pads = [(pad, estimate(*divmod(pad, width))) for pad in teleports]
+        if len(pads) <= EXACT_PADS:
+            for pad, distance in pads:
+                pr, pc = divmod(pad, width)
+                via = np.abs(np.arange(height) - pr)[:, None] + np.abs(np.arange(width) - pc)[None, :]
+                np.minimum(bound, via + distance, out=bound)
+        else:
+            cheapest = min(distance for _, distance in pads)
+            np.minimum(bound, _nearest_distance(height, width, list(teleports)) + cheapest, out=bound)
+
+    bound *= min_cost
+    return array("d", bound.tobytes())
+
+
+class Replanner:
+    """LPA* from maze.start to maze.goal with astar's step costs.
+
+    Entering a cell costs its tile (walls can't be entered) and teleport
+    pads are ordinary edges to their partner, the cost model of the
+    bidirectional A*, JPS and ALT solvers. Edits go through apply(), which
+    writes them to the maze too; moving the goal only re-keys the queue,
+    moving the start starts over.
+    """
+
+    def __init__(self, maze):
+        self.maze = maze
+        self.width = maze.width
+        self.height = maze.height
+        self.codes = bytearray(maze.tile_codes())
+        self.min_cost = min(ASTAR_COSTS[code] for code in set(self.codes) or {0})
+        self._reset()
+
+    def _reset(self):
+        n = self.width * self.height
+        self.start = self.maze.index(self.maze.start)
+        self.goal = self.maze.index(self.maze.goal)
+        self.teleports = {self.maze.index(a): self.maze.index(b) for a, b in self.maze.teleports.items()}
+        self.g = array("d", [INF]) * n
+        self.rhs = array("d", [INF]) * n
+        self.rhs[self.start] = 0
+        # Current key of every queued (inconsistent) cell, heap entries that
+        # don't match it are stale
+        self.keys = {}
+        self.queue = []
+        self._rekey()
+        self._update(self.start)
+
+    def _rekey(self):
+        # The heuristic changed (goal, teleports or cheapest tile), so every
+        # queued key is recomputed; g and rhs don't depend on it
+        self.h = heuristic_table(self.maze, self.goal, self.teleports, self.min_cost)
+        for cell in self.keys:
+            self.keys[cell] = self._key(cell)
+        self.queue = [(key[0], key[1], cell) for cell, key in self.keys.items()]
+        heapq.heapify(self.queue)
+
+    def _key(self, cell):
+        best = min(self.g[cell], self.rhs[cell])
+        return (best + self.h[cell], best)
+
+    def _neighbors(self, cell):
+        # Open cells next to cell, plus its teleport partner
+        width, codes = self.width, self.codes
+        r, c = divmod(cell, width)
+        if r > 0 and codes[cell - width] != TILE_WALL:
+            yield cell - width
+        if r < self.height - 1 and codes[cell + width] != TILE_WALL:
+            yield cell + width
+        if c > 0 and codes[cell - 1] != TILE_WALL:
+            yield cell - 1
+        if c < width - 1 and codes[cell + 1] != TILE_WALL:
+            yield cell + 1
+        partner = self.teleports.get(cell)
+        if partner is not None:
+            yield partner
+
+    def _update(self, cell):
+        g, rhs = self.g, self.rhs
+        if cell != self.start:
+            code = self.codes[cell]
+            if code == TILE_WALL:
+                rhs[cell] = INF
+            else:
+                best = INF
+                for neighbor in self._neighbors(cell):
+                    if g[neighbor] < best:
+                        best = g[neighbor]
+                rhs[cell] = best + ASTAR_COSTS[code]
+        if g[cell] != rhs[cell]:
+            key = self._key(cell)
+            self.keys[cell] = key
+            heapq.heappush(self.queue, (key[0], key[1], cell))
+        else:
+            self.keys.pop(cell, None)
+
+    def _top_key(self):
+        queue, keys = self.queue, self.keys
+        while queue:
+            k1, k2, cell = queue[0]
+            if keys.get(cell) == (k1, k2):
+                return (k1, k2)
+            heapq.heappop(queue)
+        return (INF, INF)
+
+    def _search(self):
+        g, rhs, keys, goal = self.g, self.rhs, self.keys, self.goal
+        steps = 0
+        while self._top_key() < self._key(goal) or rhs[goal] != g[goal]:
+            _, _, cell = heapq.heappop(self.queue)
+            del keys[cell]
+            steps += 1
+            if g[cell] > rhs[cell]:
+                g[cell] = rhs[cell]
+                for neighbor in self._neighbors(cell):
+                    self._update(neighbor)
+            else:
+                g[cell] = INF
+                self._update(cell)
+                for neighbor in self._neighbors(cell):
+                    self._update(neighbor)
+        return steps
+
+    def _path(self):
+        # Walk back from the goal through the neighbor each cell was reached from
+        g, goal = self.g, self.goal
+        if g[goal] == INF:
+            return None
+        cells = []
+        cell = goal
+        while cell != self.start:
+            cells.append(divmod(cell, self.width))
+            cell = min(self._neighbors(cell), key=g.__getitem__)
+        cells.reverse()
+        return cells
+
+    def plan(self):
+        """Bring the search up to date and return the current best path.
+
+        Same shape as a solver's final event, "steps" counting only the
+        cells this call had to expand.
+        """
+        start_time = time.perf_counter()
+        steps = self._search()
+        path = self._path()
+        return {
+            "status": "done" if path is not None else "failed",
+            "path": path,
+            "cost": self.g[self.goal],
+            "steps": steps,
+            "duration": time.perf_counter() - start_time,
+        }
+
+    def apply(self, edits):
+        """Apply ((row, col), char) tile edits to the maze and the planner.
+
+        Takes any mix of walls, open cells, special tiles, "A" and "B"; the
+        search is repaired lazily on the next plan().
+        """
+        maze = self.maze
+        # Check the whole batch first, set_tile refuses to paint over the
+        # start or goal and a half-applied batch would desync the planner
+        start, goal = maze.start, maze.goal
+        for state, char in edits:
+            state = tuple(state)
+            if (state == start and char != "A") or (state == goal and char != "B"):
+                raise Exception(f"Can't overwrite the start or goal at {state}, move it first")
+            if char == "A":
+                start = state
+            elif char == "B":
+                goal = state
+
+        old_start, old_goal = self.start, self.goal
+        changed = set()
+        lowest = self.min_cost
+
+        for state, char in edits:
+            index = maze.index(state)
+            if char == "B" and index != self.goal:
+                changed.add(self.goal)
+                self.codes[self.goal] = TILE_OPEN
+            elif char == "A" and index != self.start:
+                self.codes[self.start] = TILE_OPEN
+            maze.set_tile(state, char)
+            code = CHAR_TILES.get(char, TILE_WALL)
+            self.codes[index] = code
+            self.start = maze.index(maze.start)
+            self.goal = maze.index(maze.goal)
+            lowest = min(lowest, ASTAR_COSTS[code])
+            changed.add(index)
+
+        if self.start != old_start:
+            # Every g is a distance from the start, nothing can be kept
+            self.min_cost = lowest
+            self._reset()
+            return
+
+        teleports = {maze.index(a): maze.index(b) for a, b in maze.teleports.items()}
+        moved_pads = teleports != self.teleports
+        if moved_pads:
+            # Re-pairing can move pads that weren't edited
+            for pad in self.teleports.keys() | teleports.keys():
+                if self.teleports.get(pad) != teleports.get(pad):
+                    changed.add(pad)
+            self.teleports = teleports
+
+        if self.goal != old_goal or moved_pads or lowest < self.min_cost:
+            self.min_cost = lowest
+            self._rekey()
+
+        for cell in changed:
+            self._update(cell)
+
+    def set_wall(self, state, wall=True):
+        self.apply([(state, "#" if wall else " ")])
+
+    def move_goal(self, state):
+        self.apply([(state, "B")])
@@ -0,0 +1,99 @@
+# solver_trace.py
+#
+# Compact recordings of a solver run for replaying later: the flat index of
+# every expanded cell in expansion order (int32) plus the final path, saved
+# as a .npz file. Seeking to any step compares one per-cell table of
+# expansion steps (int32, rebuilt on load) against it.
+import json
+from array import array
+
+import numpy as np
+
+# Seeks shorter than max(MIN_SEEK_INTERVAL, expansions / MAX_SEEK_INTERVALS)
+# steps are cheaper to replay cell by cell than to rebuild with visited_at
+MIN_SEEK_INTERVAL = 4096
+MAX_SEEK_INTERVALS = 256
+
+
+class Trace:
+    """Expansion order and final path of one solver run on one maze."""
+
+    def __init__(self, width, height, order, path, status, steps, duration, algorithm=None):
+        self.width = width
+        self.height = height
+        self.order = np.asarray(order, dtype=np.int32)
+        self.path = np.asarray(path if path is not None else (), dtype=np.int32)
+        self.status = status
+        self.steps = steps
+        self.duration = duration
+        self.algorithm = algorithm
+
+        self.interval = max(MIN_SEEK_INTERVAL, -(-len(self.order) // MAX_SEEK_INTERVALS))
+        self._ranks = None
+
+    def __len__(self):
+        return len(self.order)
+
+    def ranks(self):
+        # Expansion step of every cell, len(self) for never; 4 bytes a cell
+        if self._ranks is None:
+            self._ranks = np.full(self.width * self.height, len(self.order), dtype=np.int32)
+            self._ranks[self.order] = np.arange(len(self.order), dtype=np.int32)
+        return self._ranks
+
+    def visited_at(self, step):
+        """Flat bool mask of the cells expanded in the first step expansions."""
+        return self.ranks() < step
+
+    def expanded_before(self, indices, step):
+        """For each flat index, whether it was expanded in the first step expansions."""
+        return self.ranks()[indices] < step
+
+    def path_cells(self):
+        return [divmod(index, self.width) for index in self.path.tolist()]
+
+    def save(self, filename):
+        meta = {
+            "width": self.width,
+            "height": self.height,
+            "status": self.status,
+            "steps": self.steps,
+            "duration": self.duration,
+            "algorithm": self.algorithm,
+        }
+        np.savez_compressed(
+            filename,
+            order=self.order,
+            path=self.path,
+            meta=np.frombuffer(json.dumps(meta).encode("utf-8"), dtype=np.uint8),
+        )
+
+    @classmethod
+    def load(cls, filename):
+        with np.load(filename) as data:
+            meta = json.loads(data["meta"].tobytes().decode("utf-8"))
+            return cls(order=data["order"], path=data["path"], **meta)
+
+
+def record(solver, maze, algorithm=None):
+    """Run solver on maze to the end and return its Trace."""
+    width = maze.width
+    order = array("i")
+    seen = bytearray(width * maze.height)
+    result = None
+    for event in solver(maze):
+        if event["status"] != "exploring":
+            result = event
+            continue
+        for r, c in event.get("expanded", ()):
+            index = r * width + c
+            if not seen[index]:
+                seen[index] = 1
+                order.append(index)
+
+    path = [r * width + c for r, c in result["path"] or ()]
+    return Trace(
+        width, maze.height, order, path,
+        result["status"], result["steps"], result["duration"],
+        algorithm or getattr(solver, "__name__", None),
+    )
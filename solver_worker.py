@@ -0,0 +1,169 @@
+# solver_worker.py
+#
+# Runs a solver from algorithms.SOLVERS in its own process. The worker writes
+# every expansion into a multiprocessing.shared_memory block as it happens,
+# and the GUI samples that block whenever it repaints, so solving never
+# waits on the UI and the UI never waits on solving.
+#
+# Block layout (n = width * height):
+#   header   HEADER_FIELDS int64: status, steps, expanded count, path length,
+#            duration in ns
+#   order    n int32, flat index of every expanded cell in expansion order
+#   path     n int32, flat indices of the final path (after the start)
+#   visited  n uint8, 1 for every expanded cell
+#   error    ERROR_SIZE bytes of UTF-8 error message
+import multiprocessing
+import time
+from multiprocessing import shared_memory
+
+import numpy as np
+
+RUNNING, DONE, FAILED, ERROR = range(4)
+STATUS_NAMES = {RUNNING: "exploring", DONE: "done", FAILED: "failed", ERROR: "error"}
+
+STATUS, STEPS, EXPANDED, PATH_LENGTH, DURATION = range(5)
+HEADER_FIELDS = 8
+ERROR_SIZE = 512
+
+
+def _views(buf, n):
+    # Typed views over the block, same layout on both sides
+    header_size = HEADER_FIELDS * 8
+    header = buf[:header_size].cast("q")
+    order = buf[header_size:header_size + 4 * n].cast("i")
+    path = buf[header_size + 4 * n:header_size + 8 * n].cast("i")
+    visited = buf[header_size + 8 * n:header_size + 9 * n]
+    error = buf[header_size + 9 * n:header_size + 9 * n + ERROR_SIZE]
+    return header, order, path, visited, error
+
+
+def _block_size(n):
+    return HEADER_FIELDS * 8 + 9 * n + ERROR_SIZE
+
+
+def _run(name, maze, algorithm):
+    # Worker process body
+    from algorithms import SOLVERS
+
+    block = shared_memory.SharedMemory(name=name)
+    width = maze.width
+    header, order, path, visited, error = _views(block.buf, maze.width * maze.height)
+    try:
+        count = 0
+        for event in SOLVERS[algorithm](maze):
+            header[STEPS] = event["steps"]
+            status = event["status"]
+            if status == "exploring":
+                for r, c in event.get("expanded", ()):
+                    index = r * width + c
+                    if not visited[index]:
+                        visited[index] = 1
+                        order[count] = index
+                        count += 1
+                # The count goes last, so the reader never sees unwritten slots
+                header[EXPANDED] = count
+            elif status in ("done", "failed"):
+                for i, (r, c) in enumerate(event["path"] or ()):
+                    path[i] = r * width + c
+                header[PATH_LENGTH] = len(event["path"] or ())
+                header[DURATION] = int(event["duration"] * 1e9)
+                header[STATUS] = DONE if status == "done" else FAILED
+                return
+        header[STATUS] = FAILED
+    except Exception as e:
+        message = str(e).encode("utf-8")[:ERROR_SIZE]
+        error[:len(message)] = message
+        header[STATUS] = ERROR
+    finally:
+        del header, order, path, visited, error
+        block.close()
+
+
+class SolverRun:
+    """One solver running in a worker process, sampled with poll()."""
+
+    def __init__(self, maze, algorithm):
+        self.maze = maze
+        self.algorithm = algorithm
+        self.width = maze.width
+        self.size = maze.width * maze.height
+        # New blocks come zero-filled: status RUNNING, nothing visited
+        self.block = shared_memory.SharedMemory(create=True, size=_block_size(self.size))
+        self.header, self.order, self.path, self.visited, self.error = _views(self.block.buf, self.size)
+        self.seen = 0
+        self.started = time.perf_counter()
+
+        self.process = multiprocessing.Process(
+            target=_run, args=(self.block.name, maze, algorithm), daemon=True
+        )
+        self.process.start()
+
+    def poll(self, limit=None):
+        """Everything new since the last poll.
+
+        Returns a dict with "status" ("exploring", "done", "failed" or
+        "error"), "steps", "expanded" (flat indices expanded since the last
+        poll, at most limit of them), "pending" (expansions not handed out
+        yet) and, once finished, "path", "duration" and "error". The run is
+        over once status isn't "exploring" and nothing is pending.
+        """
+        # Liveness, then status, then count: a final status means every
+        # expansion is already written
+        alive = self.process.is_alive()
+        status = self.header[STATUS]
+        if status == RUNNING and not alive:
+            status = ERROR
+        count = self.header[EXPANDED]
+        end = count if limit is None else min(count, self.seen + limit)
+        expanded = np.frombuffer(
+            self.order, dtype=np.int32, count=end - self.seen, offset=4 * self.seen
+        ).copy()
+        self.seen = end
+
+        result = {
+            "status": STATUS_NAMES[status],
+            "steps": self.header[STEPS],
+            "expanded": expanded,
+            "pending": count - end,
+            "path": None,
+            "duration": time.perf_counter() - self.started,
+            "error": None,
+        }
+        if status in (DONE, FAILED):
+            length = self.header[PATH_LENGTH]
+            if status == DONE:
+                result["path"] = [divmod(index, self.width) for index in self.path[:length]]
+            result["duration"] = self.header[DURATION] / 1e9
+        elif status == ERROR:
+            result["error"] = bytes(self.error).rstrip(b"\0").decode("utf-8", "replace") or "solver process died"
+        return result
+
+    def finished(self):
+        return self.header[STATUS] != RUNNING or not self.process.is_alive()
+
+    def explored_cells(self):
+        visited = np.frombuffer(self.visited, dtype=np.uint8)
+        return {divmod(index, self.width) for index in np.flatnonzero(visited).tolist()}
+
+    def trace(self):
+        """The finished run as a solver_trace.Trace, for replaying."""
+        from solver_trace import Trace
+
+        status = self.header[STATUS]
+        count = self.header[EXPANDED]
+        path = self.path[:self.header[PATH_LENGTH]] if status == DONE else ()
+        return Trace(
+            self.maze.width, self.maze.height,
+            np.frombuffer(self.order, dtype=np.int32, count=count).copy(),
+            np.array(path, dtype=np.int32),
+            STATUS_NAMES[status], self.header[STEPS], self.header[DURATION] / 1e9,
+            self.algorithm,
+        )
+
+    def stop(self):
+        if self.process.is_alive():
+            self.process.terminate()
+        self.process.join()
+        self.header = self.order = self.path = self.visited = self.error = None
+        self.block.close()
+        self.block.unlink()
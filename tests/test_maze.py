@@ -0,0 +1,72 @@
+import pytest
+
+from algorithms import bfs, run_to_completion
+from array_maze import ArrayMaze
+from maze import Maze
+from replanner import Replanner
+
+MAZE = """\
+#######
+#A   B#
+# ### #
+#     #
+#######
+"""
+
+
+@pytest.fixture(params=[Maze, ArrayMaze])
+def maze(request, tmp_path, monkeypatch):
+    # Mazes make an assets/ folder in the working directory
+    monkeypatch.chdir(tmp_path)
+    path = tmp_path / "maze.txt"
+    path.write_text(MAZE)
+    return request.param(str(path))
+
+
+@pytest.mark.parametrize("char", ["#", " ", "T", "N", "P"])
+def test_painting_over_start_or_goal_raises(maze, char):
+    start, goal = maze.start, maze.goal
+    with pytest.raises(Exception):
+        maze.set_tile(start, char)
+    with pytest.raises(Exception):
+        maze.set_tile(goal, char)
+    with pytest.raises(Exception):
+        maze.set_tile(goal, "A")
+    assert (maze.start, maze.goal) == (start, goal)
+    assert not maze.walls[start[0]][start[1]]
+    assert run_to_completion(bfs, maze)["status"] == "done"
+
+
+def test_moving_start_and_goal(maze):
+    maze.set_tile((3, 1), "A")
+    maze.set_tile((3, 5), "B")
+    assert (maze.start, maze.goal) == ((3, 1), (3, 5))
+    # The old cells were opened, so they can be painted now
+    maze.set_tile((1, 1), "#")
+    maze.set_tile((1, 5), "#")
+    result = run_to_completion(bfs, maze)
+    assert result["status"] == "done"
+    assert result["path"][-1] == (3, 5)
+
+
+def test_replanner_rejects_the_whole_batch(maze):
+    planner = Replanner(maze)
+    planner.plan()
+    with pytest.raises(Exception):
+        planner.apply([((3, 3), "#"), (maze.goal, "#")])
+    # Nothing from the rejected batch reached the maze
+    assert not maze.walls[3][3]
+    # Moving the goal first makes its old cell fair game
+    planner.apply([((3, 5), "B"), ((1, 5), "#")])
+    assert planner.plan()["path"][-1] == (3, 5)
+
+
+def test_walls_have_no_edges(maze):
+    adjacency = maze.adjacency()
+    for index, code in enumerate(maze.tile_codes()):
+        if maze.walls[index // maze.width][index % maze.width]:
+            assert adjacency.degree(index) == 0
+    # A start boxed in by walls can't reach anything through them
+    maze.set_tile((2, 1), "#")
+    maze.set_tile((1, 2), "#")
+    assert run_to_completion(bfs, maze)["status"] == "failed"
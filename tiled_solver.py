@@ -0,0 +1,445 @@
+# tiled_solver.py
+#
+# Out-of-core BFS and A* over a memory-mapped .mazb file. The maze is read
+# in fixed-size square tiles kept in an LRU cache, and the per-cell search
+# state (visited bits, parent moves, path costs, the BFS frontier) lives in
+# anonymous disk-backed mmaps instead of Python sets and dicts. A*'s open
+# list is the exception, see tiled_astar.
+#
+#   python tiled_solver.py huge.mazb -a astar --tile-size 256 --cache-tiles 64
+import argparse
+import heapq
+import mmap
+import tempfile
+import time
+from array import array
+from collections import OrderedDict
+from itertools import count
+
+import numpy as np
+
+from adjacency import UP, DOWN, LEFT, RIGHT, TELEPORT
+from algorithms import ASTAR_COSTS, _relaxed_distance
+from binary_maze import MazeFile
+from core import TILE_WALL, TILE_ENCOURAGE, TILE_PENALTY
+
+# Parent byte for the start cell, others store action code + 1 (0 = unseen)
+_START = 255
+
+
+class TileCache:
+    """LRU set of resident tiles of a MazeFile, with hit/miss counters.
+
+    Reads that stay on the tile of the previous read don't touch the LRU or
+    the counters, so hits and misses count tile switches, not cell reads.
+    """
+
+    def __init__(self, maze_file, tile_size=256, capacity=64):
+        self.maze_file = maze_file
+        self.tile_size = tile_size
+        self.capacity = capacity
+        self.tiles = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        # The tile the last code() read came from
+        self._last_key = None
+        self._last_tile = None
+
+    def tile(self, tile_row, tile_col):
+        key = (tile_row, tile_col)
+        tile = self.tiles.get(key)
+        if tile is not None:
+            self.hits += 1
+            self.tiles.move_to_end(key)
+            return tile
+
+        self.misses += 1
+        if len(self.tiles) >= self.capacity:
+            self.tiles.popitem(last=False)
+            self.evictions += 1
+        size = self.tile_size
+        top, left = tile_row * size, tile_col * size
+        # Edge tiles come back short, so pad them to keep the stride fixed
+        block = self.maze_file.tile_block(
+            top, min(top + size, self.maze_file.height),
+            left, min(left + size, self.maze_file.width),
+        )
+        padded = np.full((size, size), TILE_WALL, dtype=np.uint8)
+        padded[:block.shape[0], :block.shape[1]] = block
+        tile = self.tiles[key] = padded.tobytes()
+        return tile
+
+    def code(self, r, c):
+        size = self.tile_size
+        key = (r // size, c // size)
+        if key != self._last_key:
+            self._last_tile = self.tile(*key)
+            self._last_key = key
+        return self._last_tile[(r % size) * size + c % size]
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else None,
+            "resident": len(self.tiles),
+            "tile_size": self.tile_size,
+            "capacity": self.capacity,
+        }
+
+
+class DiskArray:
+    """Zero-filled array backed by an anonymous temporary file."""
+
+    def __init__(self, length, typecode="B", directory=None):
+        self._file = tempfile.TemporaryFile(dir=directory)
+        size = max(length * array(typecode).itemsize, 1)
+        self._file.truncate(size)
+        self._map = mmap.mmap(self._file.fileno(), size)
+        self.values = memoryview(self._map).cast(typecode)
+
+
+class DiskDeque:
+    """Fixed-capacity ring buffer of flat indices, on disk.
+
+    Enough for a BFS frontier where every cell is queued at most once.
+    """
+
+    def __init__(self, capacity, directory=None):
+        self.values = DiskArray(capacity, "q", directory).values
+        self.capacity = max(capacity, 1)
+        self.head = 0
+        self.size = 0
+
+    def append(self, index):
+        self.values[(self.head + self.size) % self.capacity] = index
+        self.size += 1
+
+    def appendleft(self, index):
+        self.head = (self.head - 1) % self.capacity
+        self.values[self.head] = index
+        self.size += 1
+
+    def popleft(self):
+        index = self.values[self.head]
+        self.head = (self.head + 1) % self.capacity
+        self.size -= 1
+        return index
+
+    def __len__(self):
+        return self.size
+
+    def __iter__(self):
+        for k in range(self.size):
+            yield self.values[(self.head + k) % self.capacity]
+
+
+class DiskBitmap:
+    """One bit per cell, on disk. Supports add, `in` and len like a set."""
+
+    def __init__(self, length, directory=None):
+        self.bits = DiskArray((length + 7) // 8, "B", directory).values
+        self.length = length
+        self.count = 0
+
+    def add(self, index):
+        byte, bit = index >> 3, 1 << (index & 7)
+        if not self.bits[byte] & bit:
+            self.bits[byte] |= bit
+            self.count += 1
+
+    def __contains__(self, index):
+        return bool(self.bits[index >> 3] >> (index & 7) & 1)
+
+    def __len__(self):
+        return self.count
+
+    def __iter__(self, chunk=1 << 20):
+        # Flat indices of set bits, unpacked a chunk of bytes at a time
+        raw = np.frombuffer(self.bits, dtype=np.uint8)
+        for first in range(0, raw.size, chunk):
+            bits = np.unpackbits(raw[first:first + chunk], bitorder="little")
+            for index in (np.flatnonzero(bits) + first * 8).tolist():
+                yield index
+
+
+class _CellView:
+    """Set-like (row, col) view over a DiskBitmap, stands in for explored."""
+
+    def __init__(self, bitmap, width):
+        self.bitmap = bitmap
+        self.width = width
+
+    def __contains__(self, position):
+        r, c = position
+        index = r * self.width + c
+        return 0 <= c < self.width and 0 <= index < self.bitmap.length and index in self.bitmap
+
+    def __len__(self):
+        return len(self.bitmap)
+
+    def __iter__(self):
+        for index in self.bitmap:
+            yield divmod(index, self.width)
+
+
+class TiledSearchState:
+    """SearchState counterpart whose expanded set is a DiskBitmap."""
+
+    def __init__(self, width, height, directory=None):
+        self.width = width
+        self.expanded = DiskBitmap(width * height, directory)
+        self.frontier = None
+
+    def explored_cells(self):
+        return _CellView(self.expanded, self.width)
+
+    def frontier_cells(self):
+        if self.frontier is None:
+            return []
+        return [divmod(index, self.width) for index in self.frontier]
+
+    def snapshot(self):
+        return {"explored": self.explored_cells(), "frontier": self.frontier_cells()}
+
+
+def _open(maze):
+    return MazeFile(maze) if isinstance(maze, str) else maze
+
+
+def _neighbors(cache, teleports, width, height, index):
+    # Same edge order as adjacency.build_adjacency
+    r, c = divmod(index, width)
+    if r > 0 and cache.code(r - 1, c) != TILE_WALL:
+        yield UP, index - width
+    if r < height - 1 and cache.code(r + 1, c) != TILE_WALL:
+        yield DOWN, index + width
+    if c > 0 and cache.code(r, c - 1) != TILE_WALL:
+        yield LEFT, index - 1
+    if c < width - 1 and cache.code(r, c + 1) != TILE_WALL:
+        yield RIGHT, index + 1
+    partner = teleports.get(index)
+    if partner is not None:
+        yield TELEPORT, partner
+
+
+def _path_to(parents, teleports, width, goal):
+    # Walk the parent moves back from the goal
+    cells = []
+    index = goal
+    while parents[index] != _START:
+        cells.append(divmod(index, width))
+        action = parents[index] - 1
+        if action == UP:
+            index += width
+        elif action == DOWN:
+            index -= width
+        elif action == LEFT:
+            index += 1
+        elif action == RIGHT:
+            index -= 1
+        else:
+            index = teleports[index]
+    cells.reverse()
+    return cells
+
+
+def _finish(status, path, search, cache, steps, start_time):
+    return {
+        "status": status,
+        "path": path,
+        "explored": search.explored_cells(),
+        "search": search,
+        "steps": steps,
+        "duration": time.perf_counter() - start_time,
+        "tile_cache": cache.stats(),
+    }
+
+
+def tiled_bfs(maze, events=True, tile_size=256, cache_tiles=64, directory=None):
+    """algorithms.bfs over a .mazb file (path or MazeFile), out of core.
+
+    Same event and result contract as bfs, expansion order included (N and
+    T cells jump the queue); finished events also carry "tile_cache" stats.
+    The frontier is a DiskDeque, so nothing per cell is held in memory.
+    """
+    maze = _open(maze)
+    width, height = maze.width, maze.height
+    teleports = {r * width + c: pr * width + pc for (r, c), (pr, pc) in maze.teleports.items()}
+    cache = TileCache(maze, tile_size, cache_tiles)
+    search = TiledSearchState(width, height, directory)
+    expanded = search.expanded
+    parents = DiskArray(width * height, "B", directory).values
+
+    start = maze.start[0] * width + maze.start[1]
+    goal = maze.goal[0] * width + maze.goal[1]
+    frontier = search.frontier = DiskDeque(width * height, directory)
+    frontier.append(start)
+    parents[start] = _START
+    steps = 0
+    start_time = time.perf_counter()
+
+    while frontier:
+        state = frontier.popleft()
+        steps += 1
+
+        if state == goal:
+            yield _finish("done", _path_to(parents, teleports, width, goal), search, cache, steps, start_time)
+            return
+
+        # Cells are queued once (parents marks them), so every pop is new
+        expanded.add(state)
+        added = []
+        for action, neighbor in _neighbors(cache, teleports, width, height, state):
+            if parents[neighbor]:
+                continue
+            parents[neighbor] = action + 1
+            if events:
+                added.append(divmod(neighbor, width))
+            r, c = divmod(neighbor, width)
+            code = cache.code(r, c)
+            if code == TILE_ENCOURAGE or (code != TILE_PENALTY and neighbor in teleports):
+                frontier.appendleft(neighbor)
+            else:
+                frontier.append(neighbor)
+
+        if events:
+            current = divmod(state, width)
+            yield {
+                "status": "exploring",
+                "current": current,
+                "expanded": [current],
+                "frontier_added": added,
+                "search": search,
+                "path": None,
+                "steps": steps,
+                "duration": time.perf_counter() - start_time
+            }
+
+    yield _finish("failed", None, search, cache, steps, start_time)
+
+
+def tiled_astar(maze, events=True, tile_size=256, cache_tiles=64, directory=None):
+    """A* over a .mazb file (path or MazeFile), out of core.
+
+    Pays astar's cost for every cell it enters, with teleports as ordinary
+    edges (the bidirectional A* and JPS cost model), and a teleport-aware
+    Manhattan heuristic. Finished events also carry "tile_cache" stats.
+
+    Visited bits, parents and costs are on disk, but the open list is still
+    an in-memory heap of Python tuples, stale entries included, so a frontier
+    of O(n) cells takes O(n) memory. tiled_bfs has no such limit.
+    """
+    maze = _open(maze)
+    width, height = maze.width, maze.height
+    teleports = {r * width + c: pr * width + pc for (r, c), (pr, pc) in maze.teleports.items()}
+    cache = TileCache(maze, tile_size, cache_tiles)
+    search = TiledSearchState(width, height, directory)
+    expanded = search.expanded
+    parents = DiskArray(width * height, "B", directory).values
+    # Only read where parents is set, so the zero fill never matters
+    costs = DiskArray(width * height, "d", directory).values
+
+    codes = set(maze.special_codes.tolist()) | {0}
+    min_cost = min(ASTAR_COSTS[code] for code in codes)
+    estimate = _relaxed_distance(maze, maze.goal)
+
+    start = maze.start[0] * width + maze.start[1]
+    goal = maze.goal[0] * width + maze.goal[1]
+    parents[start] = _START
+    costs[start] = 0
+    counter = count()
+    queue = [(0, next(counter), start)]
+    search.frontier = _QueueCells(queue)
+    steps = 0
+    start_time = time.perf_counter()
+
+    while queue:
+        _, _, state = heapq.heappop(queue)
+        if state in expanded:
+            continue
+        steps += 1
+
+        if state == goal:
+            yield _finish("done", _path_to(parents, teleports, width, goal), search, cache, steps, start_time)
+            return
+
+        expanded.add(state)
+        added = []
+        base_cost = costs[state]
+        for action, neighbor in _neighbors(cache, teleports, width, height, state):
+            if neighbor in expanded:
+                continue
+            r, c = divmod(neighbor, width)
+            new_cost = base_cost + ASTAR_COSTS[cache.code(r, c)]
+            if not parents[neighbor] or new_cost < costs[neighbor]:
+                parents[neighbor] = action + 1
+                costs[neighbor] = new_cost
+                heapq.heappush(queue, (new_cost + min_cost * estimate(r, c), next(counter), neighbor))
+                if events:
+                    added.append((r, c))
+
+        if events:
+            current = divmod(state, width)
+            yield {
+                "status": "exploring",
+                "current": current,
+                "expanded": [current],
+                "frontier_added": added,
+                "search": search,
+                "path": None,
+                "steps": steps,
+                "duration": time.perf_counter() - start_time
+            }
+
+    yield _finish("failed", None, search, cache, steps, start_time)
+
+
+class _QueueCells:
+    # Flat indices waiting in the A* heap, for frontier_cells()
+    def __init__(self, queue):
+        self.queue = queue
+
+    def __iter__(self):
+        return (entry[2] for entry in self.queue)
+
+
+TILED_SOLVERS = {
+    "bfs": tiled_bfs,
+    "astar": tiled_astar,
+}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Solve a .mazb maze out of core.")
+    parser.add_argument("maze", help=".mazb file")
+    parser.add_argument("-a", "--algorithm", choices=list(TILED_SOLVERS), default="bfs")
+    parser.add_argument("--tile-size", type=int, default=256)
+    parser.add_argument("--cache-tiles", type=int, default=64)
+    parser.add_argument("--tmp-dir", help="where the visited/parent files go")
+    args = parser.parse_args(argv)
+
+    solver = TILED_SOLVERS[args.algorithm]
+    result = None
+    for result in solver(
+        args.maze, events=False, tile_size=args.tile_size,
+        cache_tiles=args.cache_tiles, directory=args.tmp_dir,
+    ):
+        pass
+
+    stats = result["tile_cache"]
+    print(f"status:      {result['status']}")
+    print(f"path length: {len(result['path']) if result['path'] else 0}")
+    print(f"steps:       {result['steps']}")
+    print(f"duration:    {result['duration']:.3f}s")
+    print(
+        f"tile cache:  {stats['hits']} hits, {stats['misses']} misses, "
+        f"{stats['evictions']} evictions, hit rate {stats['hit_rate'] or 0:.4f}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,70 +1,365 @@
 # ui/maze_canvas.py
+import math
+
+import numpy as np
 from PyQt5.QtWidgets import QWidget
-from PyQt5.QtGui import QPainter, QColor
-from PyQt5.QtCore import Qt, QRect, QSize
+from PyQt5.QtGui import QPainter, QColor, QImage, QPixmap, qRgb, qRgba
+from PyQt5.QtCore import Qt, QPointF, QRectF
+
+from core import (
+    TILE_OPEN, TILE_WALL, TILE_START, TILE_GOAL,
+    TILE_TELEPORT, TILE_ENCOURAGE, TILE_PENALTY, TILE_CHARS
+)
+
+# Static colors, indexed by tile code
+TILE_COLORS = [qRgb(40, 40, 40)] * len(TILE_CHARS)
+TILE_COLORS[TILE_OPEN] = qRgb(237, 240, 252)      # Empty cell
+TILE_COLORS[TILE_WALL] = qRgb(40, 40, 40)         # Wall - Dark Gray
+TILE_COLORS[TILE_START] = qRgb(255, 0, 0)         # Start - Red
+TILE_COLORS[TILE_GOAL] = qRgb(0, 171, 28)         # Goal - Green
+TILE_COLORS[TILE_TELEPORT] = qRgb(138, 43, 226)   # Teleport - Purple
+TILE_COLORS[TILE_ENCOURAGE] = qRgb(255, 215, 0)   # Encouragement - Gold
+TILE_COLORS[TILE_PENALTY] = qRgb(0, 191, 255)     # Penalty - Sky Blue
+
+EXPLORED_COLOR = QColor(255, 140, 0)   # Explored - Orange
+SOLUTION_COLOR = QColor(220, 235, 113)  # Solution Path - Light Yellow
+
+# Cell outlines are only drawn when cells are at least this big
+GRID_LINE_MIN_SIZE = 4
+
+# Zoom limits, in pixels per cell (the lower one relative to fitting the maze)
+MAX_ZOOM = 100
+MIN_ZOOM_OF_FIT = 0.25
+WHEEL_STEP = 1.25
+
+# Tile colors as BGRX floats, for averaging cells into level-of-detail images
+_LOD_COLORS = np.zeros((256, 4), dtype=np.float32)
+_LOD_COLORS[:, 3] = 255
+for _code, _rgb in enumerate(TILE_COLORS):
+    _LOD_COLORS[_code, :3] = (_rgb & 0xFF, (_rgb >> 8) & 0xFF, (_rgb >> 16) & 0xFF)
+
 
 class MazeCanvas(QWidget):
+    """Draws a maze as two layers, with zoom (wheel) and pan (drag).
+
+    The static tiles live in an indexed one-pixel-per-cell image. Only the
+    visible cell range is drawn from it into a cached pixmap of the current
+    view, rebuilt when the view moves, the widget is resized or the maze is
+    edited. Below one pixel per cell the view is drawn from a downsampled
+    level-of-detail image instead, each level averaging 2^k x 2^k cells.
+
+    Explored/solution/animated cells live in a separate one-pixel-per-cell
+    overlay image, and color_cell() only repaints the rectangle of the cell
+    it changed. Double-click fits the whole maze again.
+    """
+
     def __init__(self, maze, cell_size=30):
         super().__init__()
         self.maze = maze
-        self.cell_size = cell_size
+        # Pixels per cell, None until the maze is first fitted to the widget
+        self.cell_size = None
+        # Widget position of the top-left corner of cell (0, 0)
+        self.offset = QPointF(0, 0)
         self.colored_cells = {}
 
+        # Recorded run being replayed, and the step it's shown at
+        self.trace = None
+        self.trace_step = 0
+
+        # Follow resizes until the user zooms or pans
+        self._fitted = True
+        self._drag_start = None
+
+        # Tile codes as an indexed image, one pixel per cell
+        self._tile_bytes = None
+        self._tiles = None
+        self._tiles_version = None
+        # Downsampled tiles by level, (buffer, image) pairs
+        self._levels = {}
+        # Static layer for the current view
+        self._view = None
+        self._view_key = None
+        # Indexed overlay, color 0 is transparent
+        self._overlay = None
+        self._overlay_colors = {}
+
+    # --- View transform ---
+
+    def _fit_zoom(self):
+        return min(self.width() / self.maze.width, self.height() / self.maze.height)
+
+    def fit(self):
+        self.cell_size = self._fit_zoom()
+        self.offset = QPointF(0, 0)
+        self._fitted = True
+        self.update()
+
+    def _cell_range(self, rect):
+        # Cells overlapping a widget rectangle, clipped to the maze
+        size = self.cell_size
+        left = max(0, math.floor((rect.left() - self.offset.x()) / size))
+        top = max(0, math.floor((rect.top() - self.offset.y()) / size))
+        right = min(self.maze.width, math.ceil((rect.right() + 1 - self.offset.x()) / size))
+        bottom = min(self.maze.height, math.ceil((rect.bottom() + 1 - self.offset.y()) / size))
+        return left, top, right, bottom
+
+    def _cells_rect(self, left, top, right, bottom):
+        size = self.cell_size
+        return QRectF(
+            self.offset.x() + left * size, self.offset.y() + top * size,
+            (right - left) * size, (bottom - top) * size,
+        )
+
+    def wheelEvent(self, event):
+        if not self.cell_size:
+            return
+        steps = event.angleDelta().y() / 120
+        zoom = self.cell_size * WHEEL_STEP ** steps
+        zoom = max(self._fit_zoom() * MIN_ZOOM_OF_FIT, min(MAX_ZOOM, zoom))
+
+        # Keep the point under the cursor where it is
+        anchor = QPointF(event.pos())
+        self.offset = anchor - (anchor - self.offset) * (zoom / self.cell_size)
+        self.cell_size = zoom
+        self._fitted = False
+        self.update()
+
+    def mousePressEvent(self, event):
+        if event.button() in (Qt.LeftButton, Qt.MiddleButton):
+            self._drag_start = (QPointF(event.pos()), QPointF(self.offset))
+            self.setCursor(Qt.ClosedHandCursor)
+
+    def mouseMoveEvent(self, event):
+        if self._drag_start is None:
+            return
+        origin, offset = self._drag_start
+        self.offset = offset + (QPointF(event.pos()) - origin)
+        self._fitted = False
+        self.update()
+
+    def mouseReleaseEvent(self, event):
+        self._drag_start = None
+        self.unsetCursor()
+
+    def mouseDoubleClickEvent(self, event):
+        self.fit()
+
+    def resizeEvent(self, event):
+        if self._fitted and self.maze:
+            self.cell_size = self._fit_zoom()
+        super().resizeEvent(event)
+
+    # --- Layers ---
+
+    def _build_tiles(self):
+        width, height = self.maze.width, self.maze.height
+        # The image reads straight from this buffer, so keep it alive
+        self._tile_bytes = bytes(self.maze.tile_codes())
+        image = QImage(self._tile_bytes, width, height, width, QImage.Format_Indexed8)
+        image.setColorTable(TILE_COLORS)
+        return image
+
+    def _level(self, level):
+        # Average colors of factor x factor cell blocks, built in row bands
+        if level not in self._levels:
+            factor = 2 ** level
+            width, height = self.maze.width, self.maze.height
+            codes = np.frombuffer(self._tile_bytes, dtype=np.uint8).reshape(height, width)
+            out_w, out_h = -(-width // factor), -(-height // factor)
+            out = np.empty((out_h, out_w, 4), dtype=np.uint8)
+
+            band = max(1, 256 // factor)
+            for first in range(0, out_h, band):
+                rows = codes[first * factor:(first + band) * factor]
+                # Ragged edges are padded with walls
+                block = np.full(
+                    (-(-rows.shape[0] // factor) * factor, out_w * factor), TILE_WALL, dtype=np.uint8
+                )
+                block[:rows.shape[0], :width] = rows
+                colors = _LOD_COLORS[block].reshape(-1, factor, out_w, factor, 4)
+                out[first:first + colors.shape[0]] = colors.mean(axis=(1, 3))
+
+            data = out.tobytes()
+            image = QImage(data, out_w, out_h, out_w * 4, QImage.Format_RGB32)
+            self._levels[level] = (data, image)
+        return self._levels[level][1]
+
+    def _blank_overlay(self):
+        overlay = QImage(self.maze.width, self.maze.height, QImage.Format_Indexed8)
+        overlay.setColorTable([qRgba(0, 0, 0, 0)])
+        overlay.fill(0)
+        self._overlay = overlay
+        self._overlay_colors = {}
+
+    def _build_overlay(self):
+        self._blank_overlay()
+
+        for row, col in self.maze.explored:
+            self._set_overlay(row, col, EXPLORED_COLOR)
+        for row, col in self.maze.solution or ():
+            self._set_overlay(row, col, SOLUTION_COLOR)
+        for (row, col), color in self.colored_cells.items():
+            self._set_overlay(row, col, color)
+
+    def _color_index(self, color):
+        rgba = color.rgba()
+        index = self._overlay_colors.get(rgba)
+        if index is None:
+            table = self._overlay.colorTable()
+            # An indexed image has 256 slots, later colors share the last one
+            index = min(len(table), 255)
+            if index == len(table):
+                table.append(rgba)
+                self._overlay.setColorTable(table)
+            self._overlay_colors[rgba] = index
+        return index
+
+    def _set_overlay(self, row, col, color):
+        self._overlay.setPixel(col, row, self._color_index(color))
+
+    def _overlay_pixels(self):
+        # Writable (height, width) array over the overlay's pixel indices
+        bits = self._overlay.bits()
+        bits.setsize(self._overlay.sizeInBytes())
+        pixels = np.frombuffer(bits, dtype=np.uint8).reshape(self.maze.height, self._overlay.bytesPerLine())
+        return pixels[:, :self.maze.width]
+
+    def _render_view(self):
+        view = QPixmap(self.size())
+        view.fill(self.palette().window().color())
+        painter = QPainter(view)
+        left, top, right, bottom = self._cell_range(view.rect())
+        if left < right and top < bottom:
+            target = self._cells_rect(left, top, right, bottom)
+            if self.cell_size > 0.5:
+                # Level 0 is the tile image itself, no averaging needed
+                painter.drawImage(target, self._tiles, QRectF(left, top, right - left, bottom - top))
+            else:
+                # Coarsest level that still has at least one pixel per screen
+                # pixel, averaged levels start at 2x2 blocks
+                level = max(1, int(math.log2(1 / self.cell_size)))
+                factor = 2 ** level
+                painter.drawImage(target, self._level(level), QRectF(
+                    left / factor, top / factor, (right - left) / factor, (bottom - top) / factor
+                ))
+        painter.end()
+        return view
+
+    def _ensure_layers(self):
+        version = getattr(self.maze, "version", 0)
+        if self._tiles is None or self._tiles_version != version:
+            self._tiles = self._build_tiles()
+            self._tiles_version = version
+            self._levels = {}
+            self._view = None
+        if self._overlay is None:
+            self._build_overlay()
+        if self.cell_size is None:
+            self.cell_size = self._fit_zoom()
+
+        key = (self.cell_size, self.offset.x(), self.offset.y(), self.width(), self.height(), version)
+        if self._view is None or self._view_key != key:
+            self._view = self._render_view()
+            self._view_key = key
+
     def paintEvent(self, event):
         if not self.maze or not self.maze.grid:
             return  # Safeguard: don't paint if maze is not loaded
 
+        self._ensure_layers()
         painter = QPainter(self)
-        width = self.width()
-        height = self.height()
-
-        # Dynamically compute square cell size
-        cell_width = width / self.maze.width
-        cell_height = height / self.maze.height
-        cell_size = int(min(cell_width, cell_height))  # Make square
-
-        for i in range(self.maze.height):
-            for j in range(self.maze.width):
-                x = j * cell_size
-                y = i * cell_size
-
-                # Default color logic
-                if (i, j) == self.maze.start:
-                    fill = QColor(255, 0, 0)  # Start - Red
-                elif (i, j) == self.maze.goal:
-                    fill = QColor(0, 171, 28)  # Goal - Green
-                elif (i, j) in self.maze.teleports:
-                    fill = QColor(138, 43, 226)  # Teleport - Purple
-                elif (i, j) in self.maze.encouragements:
-                    fill = QColor(255, 215, 0)  # Encouragement - Gold
-                elif (i, j) in self.maze.penalties:
-                    fill = QColor(0, 191, 255)  # Penalty - Sky Blue
-                elif self.maze.walls[i][j]:
-                    fill = QColor(40, 40, 40)  # Wall - Dark Gray
-                elif self.maze.solution and (i, j) in self.maze.solution[1]:
-                    fill = QColor(220, 235, 113)  # Solution Path - Light Yellow
-                elif (i, j) in self.maze.explored:
-                    fill = QColor(255, 140, 0)  # Explored - Orange
-                else:
-                    fill = QColor(237, 240, 252)  # Empty cell
-
-                # Override with animated cell color if exists
-                if (i, j) in self.colored_cells:
-                    fill = self.colored_cells[(i, j)]
-
-                painter.fillRect(x, y, cell_size, cell_size, fill)
-                painter.drawRect(x, y, cell_size, cell_size)
+        rect = event.rect()
+        painter.drawPixmap(rect, self._view, rect)
 
+        # Only the visible cells under the dirty rectangle get their overlay redrawn
+        left, top, right, bottom = self._cell_range(rect)
+        if left >= right or top >= bottom:
+            return
+        painter.drawImage(
+            self._cells_rect(left, top, right, bottom),
+            self._overlay,
+            QRectF(left, top, right - left, bottom - top),
+        )
+
+        size = self.cell_size
+        if size >= GRID_LINE_MIN_SIZE:
+            x0, y0 = self.offset.x(), self.offset.y()
+            for row in range(top, bottom + 1):
+                y = y0 + row * size
+                painter.drawLine(QPointF(x0 + left * size, y), QPointF(x0 + right * size, y))
+            for col in range(left, right + 1):
+                x = x0 + col * size
+                painter.drawLine(QPointF(x, y0 + top * size), QPointF(x, y0 + bottom * size))
 
     def color_cell(self, row, col, color: QColor):
         self.colored_cells[(row, col)] = color
-        self.update()
+        if self._overlay is not None:
+            self._set_overlay(row, col, color)
+        if self.cell_size:
+            self.update(self._cells_rect(col, row, col + 1, row + 1).toAlignedRect().adjusted(0, 0, 1, 1))
 
-    def reset(self):
-        self.colored_cells.clear() 
-        self.update()              
+    def mark_cells(self, indices, color: QColor):
+        """Color many cells at once, given as flat indices (row * width + col).
 
+        Writes straight into the overlay's pixels and repaints the bounding
+        box of the cells, so a whole batch of expansions costs one update.
+        """
+        if len(indices) == 0:
+            return
+        if self._overlay is None:
+            self._build_overlay()
+        rows, cols = np.divmod(np.asarray(indices, dtype=np.int64), self.maze.width)
+        self._overlay_pixels()[rows, cols] = self._color_index(color)
+        if self.cell_size:
+            rect = self._cells_rect(cols.min(), rows.min(), cols.max() + 1, rows.max() + 1)
+            self.update(rect.toAlignedRect().adjusted(0, 0, 1, 1))
 
+    def load_trace(self, trace, step=0):
+        """Replay a solver_trace.Trace, starting at the given step."""
+        self.colored_cells.clear()
+        self._blank_overlay()
+        self.trace = trace
+        self.trace_step = 0
+        self.seek(step)
 
+    def seek(self, step):
+        """Show the trace as it was after step expansions.
 
+        Short moves just mark or clear the cells in between; longer jumps
+        redraw the whole overlay from the trace's expansion-step table.
+        """
+        trace = self.trace
+        step = max(0, min(step, len(trace)))
+        explored = self._color_index(EXPLORED_COLOR)
+        solution = self._color_index(SOLUTION_COLOR)
+        pixels = self._overlay_pixels()
+        width = self.maze.width
 
+        if abs(step - self.trace_step) <= trace.interval:
+            low, high = sorted((self.trace_step, step))
+            rows, cols = np.divmod(trace.order[low:high].astype(np.int64), width)
+            pixels[rows, cols] = explored if step > self.trace_step else 0
+        else:
+            mask = trace.visited_at(step).reshape(self.maze.height, width)
+            # Straight into the uint8 pixels, no full-size temporary
+            np.multiply(mask, np.uint8(explored), out=pixels)
+
+        # The path only shows once the replay reaches the end
+        if len(trace.path):
+            rows, cols = np.divmod(trace.path.astype(np.int64), width)
+            if step == len(trace) and trace.status == "done":
+                pixels[rows, cols] = solution
+            else:
+                visited = trace.expanded_before(trace.path, step)
+                pixels[rows, cols] = np.where(visited, explored, 0)
+
+        self.trace_step = step
+        self.update()
+
+    def reset(self):
+        self.trace = None
+        self.trace_step = 0
+        self.colored_cells.clear()
+        # Rebuilt from the maze's explored/solution on the next paint
+        self._overlay = None
+        self.update()
@@ -1,15 +1,45 @@
 import sys
+import time
 from PyQt5.QtWidgets import (
     QApplication, QMainWindow, QPushButton, QVBoxLayout, QWidget,
     QFileDialog, QHBoxLayout, QLabel, QTableWidget, QTableWidgetItem,
-    QSizePolicy, QGroupBox, QGridLayout, QSpacerItem
+    QSizePolicy, QGroupBox, QGridLayout, QSpacerItem, QSlider
 )
 from PyQt5.QtCore import QTimer, Qt
 from PyQt5.QtGui import QColor, QFont
 
-from maze import Maze
+from binary_maze import load_maze
 from ui.maze_canvas import MazeCanvas  # Adjust path if needed
-from algorithms import bfs, dfs, astar, dijkstra, lhr, rhr, deadendfill
+from solver_worker import SolverRun
+from solver_trace import Trace
+
+# The canvas samples the running solver at about 60 FPS, spending at most
+# FRAME_BUDGET_S per frame on new cells, BATCH_SIZE cells at a time
+FRAME_INTERVAL_MS = 16
+FRAME_BUDGET_S = 0.010
+BATCH_SIZE = 50000
+
+# Speed slider: positions 0..SPEED_STEPS - 1 map to 1..10^4 steps/sec on a
+# log scale, the last position (SPEED_STEPS) is unlimited
+SPEED_STEPS = 40
+DEFAULT_SPEED = 20
+
+EXPLORED_COLOR = QColor(255, 140, 0)
+SOLUTION_COLOR = QColor(220, 235, 113)
+
+ALGORITHM_NAMES = {
+    'bfs': 'BFS',
+    'dfs': 'DFS',
+    'astar': 'A*',
+    'alt': 'A* (ALT)',
+    'dijkstra': 'Dijkstra',
+    'lhr': 'Left-Hand Rule',
+    'rhr': 'Right-Hand Rule',
+    'deadendfill': 'Dead-End Fill',
+    'bibfs': 'Bidirectional BFS',
+    'biastar': 'Bidirectional A*',
+    'jps': 'Jump Point Search',
+}
 
 
 class MazeGUI(QMainWindow):
@@ -18,8 +48,15 @@ class MazeGUI(QMainWindow):
         self.setWindowTitle("Maze Solver - Animated Algorithms")
         self.setGeometry(100, 100, 900, 700)
 
-        # Algorithm animation related
-        self.algorithm_generator = None
+        # Algorithm animation related: the solver runs in a worker process
+        # and the timer samples it once per frame
+        self.solver_run = None
+        self.algorithm = None
+        self.step_allowance = 0.0
+        self.last_tick = None
+        self.finishing = False
+        # Recording of the last finished run, replayed with the replay slider
+        self.trace = None
         self.timer = QTimer()
         self.timer.timeout.connect(self.animate_step)
 
@@ -108,11 +145,21 @@ class MazeGUI(QMainWindow):
         self.bfs_button.clicked.connect(self.run_bfs)
         button_layout.addWidget(self.bfs_button)
 
+        self.bibfs_button = QPushButton("Solve Bi-BFS")
+        self.bibfs_button.setToolTip("Bidirectional Breadth First Search")
+        self.bibfs_button.clicked.connect(self.run_bibfs)
+        button_layout.addWidget(self.bibfs_button)
+
         self.astar_button = QPushButton("Solve A*")
         self.astar_button.setToolTip("A* Search Algorithm")
         self.astar_button.clicked.connect(self.run_astar)
         button_layout.addWidget(self.astar_button)
 
+        self.biastar_button = QPushButton("Solve Bi-A*")
+        self.biastar_button.setToolTip("Bidirectional A* Search")
+        self.biastar_button.clicked.connect(self.run_biastar)
+        button_layout.addWidget(self.biastar_button)
+
         self.dijkstra_button = QPushButton("Solve Dijkstra")
         self.dijkstra_button.setToolTip("Dijkstra's Algorithm")
         self.dijkstra_button.clicked.connect(self.run_dijkstra)
@@ -138,7 +185,58 @@ class MazeGUI(QMainWindow):
         self.reset_button.clicked.connect(self.reset_all)
         button_layout.addWidget(self.reset_button)
 
-        button_group.setLayout(button_layout)
+        # Animation speed and skip-to-end
+        speed_layout = QHBoxLayout()
+        speed_layout.setSpacing(12)
+        speed_layout.addWidget(QLabel("Speed"))
+
+        self.speed_slider = QSlider(Qt.Horizontal)
+        self.speed_slider.setRange(0, SPEED_STEPS)
+        self.speed_slider.setValue(DEFAULT_SPEED)
+        self.speed_slider.setToolTip("Animation speed, in search steps per second")
+        self.speed_slider.valueChanged.connect(self.update_speed_label)
+        speed_layout.addWidget(self.speed_slider, 1)
+
+        self.speed_label = QLabel()
+        self.speed_label.setMinimumWidth(110)
+        speed_layout.addWidget(self.speed_label)
+        self.update_speed_label()
+
+        self.finish_button = QPushButton("Finish Instantly")
+        self.finish_button.setToolTip("Skip the animation and show the final result")
+        self.finish_button.clicked.connect(self.finish_instantly)
+        speed_layout.addWidget(self.finish_button)
+
+        # Replay of the last run, scrubbed step by step
+        replay_layout = QHBoxLayout()
+        replay_layout.setSpacing(12)
+        replay_layout.addWidget(QLabel("Replay"))
+
+        self.replay_slider = QSlider(Qt.Horizontal)
+        self.replay_slider.setToolTip("Scrub through the last run")
+        self.replay_slider.valueChanged.connect(self.seek_replay)
+        replay_layout.addWidget(self.replay_slider, 1)
+
+        self.replay_label = QLabel()
+        self.replay_label.setMinimumWidth(110)
+        replay_layout.addWidget(self.replay_label)
+
+        self.save_trace_button = QPushButton("Save Trace")
+        self.save_trace_button.setToolTip("Save the last run for replaying later (*.npz)")
+        self.save_trace_button.clicked.connect(self.save_trace)
+        replay_layout.addWidget(self.save_trace_button)
+
+        self.load_trace_button = QPushButton("Load Trace")
+        self.load_trace_button.setToolTip("Replay a saved run on the current maze")
+        self.load_trace_button.clicked.connect(self.load_trace)
+        replay_layout.addWidget(self.load_trace_button)
+        self.set_trace(None)
+
+        controls_layout = QVBoxLayout()
+        controls_layout.addLayout(button_layout)
+        controls_layout.addLayout(speed_layout)
+        controls_layout.addLayout(replay_layout)
+        button_group.setLayout(controls_layout)
         main_layout.addWidget(button_group)
 
         # --- Performance Table ---
@@ -159,10 +257,15 @@ class MazeGUI(QMainWindow):
         self.reset_button.setShortcut("Ctrl+R")
 
     def load_maze(self):
-        file_path, _ = QFileDialog.getOpenFileName(self, "Open Maze File", "assets", "Text Files (*.txt)")
+        file_path, _ = QFileDialog.getOpenFileName(
+            self, "Open Maze File", "assets",
+            "Maze Files (*.txt *.mazb);;Text Files (*.txt);;Binary Mazes (*.mazb)",
+        )
         if file_path:
+            self.stop_solver()
+            self.set_trace(None)
             try:
-                self.maze = Maze(file_path)
+                self.maze = load_maze(file_path)
             except Exception as e:
                 self.status_label.setText(f"Failed to load maze: {e}")
                 return
@@ -180,24 +283,114 @@ class MazeGUI(QMainWindow):
             self.performance_data.clear()
             self.update_performance_table()
 
-    def run_algorithm(self, algo_func, speed=50):
+    def run_algorithm(self, algorithm):
         if not self.maze:
             self.status_label.setText("Please load a maze first!")
             return
         self.reset_for_new_algorithm()
-        self.algorithm_generator = algo_func(self.maze)
-        self.timer.start(speed)
+        self.algorithm = algorithm
+        self.solver_run = SolverRun(self.maze, algorithm)
+        self.step_allowance = 0.0
+        self.last_tick = time.perf_counter()
+        self.finishing = False
+        self.timer.start(FRAME_INTERVAL_MS)
+
+    def steps_per_second(self):
+        # None means unlimited
+        value = self.speed_slider.value()
+        return None if value == SPEED_STEPS else 10 ** (4 * value / (SPEED_STEPS - 1))
+
+    def update_speed_label(self):
+        speed = self.steps_per_second()
+        self.speed_label.setText("Unlimited" if speed is None else f"{speed:,.0f} steps/s")
+
+    def finish_instantly(self):
+        # Stop painting until the worker is done, then show the end state once
+        if self.solver_run:
+            self.finishing = True
+
+    def set_trace(self, trace):
+        # Show a finished run (or nothing) on the canvas and the replay slider
+        self.trace = trace
+        self.replay_slider.blockSignals(True)
+        self.replay_slider.setRange(0, len(trace) if trace else 0)
+        self.replay_slider.setValue(len(trace) if trace else 0)
+        self.replay_slider.blockSignals(False)
+        self.replay_slider.setEnabled(trace is not None)
+        self.save_trace_button.setEnabled(trace is not None)
+        if trace is not None:
+            self.canvas.load_trace(trace, len(trace))
+        self.update_replay_label()
+
+    def update_replay_label(self):
+        if self.trace is None:
+            self.replay_label.setText("")
+        else:
+            self.replay_label.setText(f"{self.replay_slider.value():,} / {len(self.trace):,}")
 
-    def run_bfs(self): self.run_algorithm(bfs, 100)
-    def run_dfs(self): self.run_algorithm(dfs, 100)
-    def run_astar(self): self.run_algorithm(astar, 50)
-    def run_dijkstra(self): self.run_algorithm(dijkstra, 50)
-    def run_lhr(self): self.run_algorithm(lhr, 50)
-    def run_rhr(self): self.run_algorithm(rhr, 50)
-    def run_deadendfill(self): self.run_algorithm(deadendfill, 30)
+    def seek_replay(self, step):
+        if self.trace is not None:
+            self.canvas.seek(step)
+            self.update_replay_label()
 
-    def reset_for_new_algorithm(self):
+    def save_trace(self):
+        if self.trace is None:
+            return
+        file_path, _ = QFileDialog.getSaveFileName(self, "Save Trace", "", "Trace Files (*.npz)")
+        if file_path:
+            try:
+                self.trace.save(file_path)
+            except Exception as e:
+                self.status_label.setText(f"Failed to save trace: {e}")
+                return
+            self.status_label.setText(f"Trace saved to {file_path}")
+
+    def load_trace(self):
+        if not self.maze:
+            self.status_label.setText("Please load a maze first!")
+            return
+        file_path, _ = QFileDialog.getOpenFileName(self, "Open Trace", "", "Trace Files (*.npz)")
+        if not file_path:
+            return
+        try:
+            trace = Trace.load(file_path)
+        except Exception as e:
+            self.status_label.setText(f"Failed to load trace: {e}")
+            return
+        if (trace.width, trace.height) != (self.maze.width, self.maze.height):
+            self.status_label.setText(
+                f"Trace is for a {trace.width}x{trace.height} maze, "
+                f"this one is {self.maze.width}x{self.maze.height}"
+            )
+            return
+
+        self.reset_for_new_algorithm()
+        self.algorithm = trace.algorithm
+        self.set_trace(trace)
+        self.status_label.setText(
+            f"Replaying {self.get_current_algorithm_name()} | {trace.status} | "
+            f"Steps: {trace.steps} | Time: {trace.duration:.3f}s"
+        )
+
+    def run_bfs(self): self.run_algorithm("bfs")
+    def run_dfs(self): self.run_algorithm("dfs")
+    def run_bibfs(self): self.run_algorithm("bibfs")
+    def run_astar(self): self.run_algorithm("astar")
+    def run_biastar(self): self.run_algorithm("biastar")
+    def run_dijkstra(self): self.run_algorithm("dijkstra")
+    def run_lhr(self): self.run_algorithm("lhr")
+    def run_rhr(self): self.run_algorithm("rhr")
+    def run_deadendfill(self): self.run_algorithm("deadendfill")
+
+    def stop_solver(self):
         self.timer.stop()
+        if self.solver_run:
+            self.solver_run.stop()
+            self.solver_run = None
+
+    def reset_for_new_algorithm(self):
+        self.stop_solver()
+        self.set_trace(None)
         if self.maze:
             self.maze.reset()
         if self.canvas:
@@ -206,80 +399,86 @@ class MazeGUI(QMainWindow):
             self.canvas.update()
 
     def animate_step(self):
-        try:
-            result = next(self.algorithm_generator)
-
-            if result["status"] == "exploring":
-                row, col = result["current"]
-                self.canvas.color_cell(row, col, QColor(255, 140, 0))
-                algo_name = self.get_current_algorithm_name()
-                self.status_label.setText(
-                    f"Algorithm: {algo_name} | Exploring... Steps: {result['steps']} | "
-                    f"Time: {result['duration']:.3f}s"
-                )
-                self.canvas.update()
-
-            elif result["status"] == "done":
-                if result["path"]:
-                    for row, col in result["path"]:
-                        self.canvas.color_cell(row, col, QColor(220, 235, 113))
-                algo_name = self.get_current_algorithm_name()
-                path_length = len(result["path"]) if result["path"] else 0
-                self.status_label.setText(
-                    f"Algorithm: {algo_name} | Solution found! Path length: {path_length} | "
-                    f"Steps: {result['steps']} | Time: {result['duration']:.3f}s"
-                )
-                self.timer.stop()
-                self.canvas.update()
-                self.record_performance(algo_name, result['steps'], result['duration'])
-
-            elif result["status"] == "failed":
-                algo_name = self.get_current_algorithm_name()
-                self.status_label.setText(
-                    f"Algorithm: {algo_name} | No solution found! Steps: {result['steps']} | "
-                    f"Time: {result['duration']:.3f}s"
-                )
-                self.timer.stop()
-                self.canvas.update()
-                self.record_performance(algo_name, result['steps'], result['duration'])
-
-            elif result["status"] == "ready_for_pathfinding":
-                self.status_label.setText("Dead-end pruning complete! Starting pathfinding...")
-
-        except StopIteration:
+        # Reveal as many expansions as the speed allows and the frame budget
+        # fits, then let Qt paint them all at once
+        run = self.solver_run
+        if run is None:
             self.timer.stop()
-            algo_name = self.get_current_algorithm_name()
-            self.status_label.setText(f"Algorithm: {algo_name} | Completed")
+            return
+        algo_name = self.get_current_algorithm_name()
 
-        except Exception as e:
-            self.timer.stop()
-            self.status_label.setText(f"Error during algorithm execution: {e}")
-            print(f"Animation error: {e}")
+        now = time.perf_counter()
+        rate = self.steps_per_second()
+        if self.finishing:
+            if not run.finished():
+                self.status_label.setText(f"Algorithm: {algo_name} | Finishing...")
+                return
+            allowance = None
+        elif rate is None:
+            allowance = None
+        else:
+            self.step_allowance += rate * (now - self.last_tick)
+            allowance = int(self.step_allowance)
+            self.step_allowance -= allowance
+        self.last_tick = now
+
+        deadline = now + FRAME_BUDGET_S
+        while True:
+            batch = BATCH_SIZE if allowance is None else min(allowance, BATCH_SIZE)
+            result = run.poll(batch)
+            self.canvas.mark_cells(result["expanded"], EXPLORED_COLOR)
+            if allowance is not None:
+                allowance -= len(result["expanded"])
+            if not result["pending"] or allowance == 0:
+                break
+            if time.perf_counter() > deadline and not self.finishing:
+                break
+        if allowance and not result["pending"]:
+            # The solver is behind the animation, nothing to catch up on later
+            self.step_allowance = 0.0
+
+        if result["status"] == "exploring" or result["pending"]:
+            self.status_label.setText(
+                f"Algorithm: {algo_name} | Exploring... Steps: {run.seen} | "
+                f"Time: {result['duration']:.3f}s"
+            )
+            return
+
+        if result["status"] == "done":
+            if result["path"]:
+                width = self.maze.width
+                self.canvas.mark_cells([r * width + c for r, c in result["path"]], SOLUTION_COLOR)
+            path_length = len(result["path"]) if result["path"] else 0
+            self.status_label.setText(
+                f"Algorithm: {algo_name} | Solution found! Path length: {path_length} | "
+                f"Steps: {result['steps']} | Time: {result['duration']:.3f}s"
+            )
+            self.record_performance(algo_name, result['steps'], result['duration'])
+
+        elif result["status"] == "failed":
+            self.status_label.setText(
+                f"Algorithm: {algo_name} | No solution found! Steps: {result['steps']} | "
+                f"Time: {result['duration']:.3f}s"
+            )
+            self.record_performance(algo_name, result['steps'], result['duration'])
+
+        else:
+            self.status_label.setText(f"Error during algorithm execution: {result['error']}")
+            print(f"Animation error: {result['error']}")
+
+        self.maze.explored = run.explored_cells()
+        if result["status"] in ("done", "failed"):
+            self.set_trace(run.trace())
+        self.stop_solver()
 
     def get_current_algorithm_name(self):
-        if not self.algorithm_generator:
+        if not self.algorithm:
             return "Unknown"
-        gen = self.algorithm_generator
-        if hasattr(gen, 'gi_code'):
-            # For generators, get the function name
-            name = gen.gi_code.co_name
-        elif hasattr(gen, '__name__'):
-            name = gen.__name__
-        else:
-            name = str(type(gen))
-        mapping = {
-            'bfs': 'BFS',
-            'dfs': 'DFS',
-            'astar': 'A*',
-            'dijkstra': 'Dijkstra',
-            'lhr': 'Left-Hand Rule',
-            'rhr': 'Right-Hand Rule',
-            'deadendfill': 'Dead-End Fill'
-        }
-        return mapping.get(name, name.upper())
+        return ALGORITHM_NAMES.get(self.algorithm, self.algorithm.upper())
 
     def reset_all(self):
-        self.timer.stop()
+        self.stop_solver()
+        self.set_trace(None)
         if self.maze:
             self.maze.reset()
         if self.canvas:
@@ -290,6 +489,10 @@ class MazeGUI(QMainWindow):
         self.performance_data.clear()
         self.update_performance_table()
 
+    def closeEvent(self, event):
+        self.stop_solver()
+        super().closeEvent(event)
+
     def record_performance(self, algo_name, steps, duration):
         self.performance_data.append((algo_name, steps, duration))
         self.update_performance_table()
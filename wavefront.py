@@ -0,0 +1,139 @@
+# wavefront.py
+import numpy as np
+
+from adjacency import UP, DOWN, LEFT, RIGHT, TELEPORT
+
+# Predecessor code for the source and for unreachable cells
+NO_PREDECESSOR = 255
+
+# Waves at most this wide are expanded cell by cell instead of as arrays
+NARROW_WAVE = 64
+
+
+def _open_mask(maze):
+    if hasattr(maze, "open_mask"):
+        return maze.open_mask()
+    return ~np.array(maze.walls, dtype=bool)
+
+
+def wavefront(maze, source=None):
+    """BFS distance from source (default maze.start) to every cell.
+
+    The whole frontier is expanded per wave as an array of flat indices,
+    shifted by -width, +width, -1 and +1 and masked against the open cells,
+    with teleport pairs taken as one extra step per wave. Narrow waves (long
+    corridors) are stepped cell by cell over the same buffers.
+
+    Returns (dist, pred), both shaped like the maze: dist is the number of
+    moves (-1 if unreachable) and pred is the action code (adjacency.UP ...
+    TELEPORT) of the move that reached the cell, which path_to() follows back.
+    """
+    height, width = maze.height, maze.width
+    n = height * width
+    source = maze.start if source is None else source
+
+    open_cells = _open_mask(maze).reshape(-1)
+    dist = np.full(n, -1, dtype=np.int32)
+    pred = np.full(n, NO_PREDECESSOR, dtype=np.uint8)
+    visited = np.zeros(n, dtype=bool)
+
+    pads = np.array([maze.index(a) for a in maze.teleports], dtype=np.int64)
+    partners = np.array([maze.index(b) for b in maze.teleports.values()], dtype=np.int64)
+
+    teleports = dict(zip(pads.tolist(), partners.tolist()))
+
+    # Python-level views sharing the same buffers, for narrow waves
+    open_view = memoryview(open_cells)
+    visited_view = memoryview(visited)
+    dist_view = memoryview(dist)
+    pred_view = memoryview(pred)
+
+    start = maze.index(source)
+    frontier = [start]
+    visited[start] = True
+    dist[start] = 0
+    wave = 0
+
+    while len(frontier):
+        wave += 1
+
+        if len(frontier) <= NARROW_WAVE:
+            # Corridors keep the front a few cells wide, where per-wave array
+            # overhead would dominate, so walk those cells directly
+            reached = []
+            for cell in frontier if isinstance(frontier, list) else frontier.tolist():
+                col = cell % width
+                for action, target, valid in (
+                    (UP, cell - width, cell >= width),
+                    (DOWN, cell + width, cell < n - width),
+                    (LEFT, cell - 1, col > 0),
+                    (RIGHT, cell + 1, col < width - 1),
+                ):
+                    if valid and open_view[target] and not visited_view[target]:
+                        visited_view[target] = True
+                        pred_view[target] = action
+                        dist_view[target] = wave
+                        reached.append(target)
+                partner = teleports.get(cell)
+                if partner is not None and not visited_view[partner]:
+                    visited_view[partner] = True
+                    pred_view[partner] = TELEPORT
+                    dist_view[partner] = wave
+                    reached.append(partner)
+            frontier = reached
+            continue
+
+        frontier = np.asarray(frontier, dtype=np.int64)
+        col = frontier % width
+        reached = []
+        for action, offset, valid in (
+            (UP, -width, frontier >= width),
+            (DOWN, width, frontier < n - width),
+            (LEFT, -1, col > 0),
+            (RIGHT, 1, col < width - 1),
+        ):
+            cells = frontier[valid] + offset
+            cells = cells[open_cells[cells] & ~visited[cells]]
+            visited[cells] = True
+            pred[cells] = action
+            reached.append(cells)
+
+        if pads.size:
+            hop = (dist[pads] == wave - 1) & ~visited[partners]
+            cells = partners[hop]
+            visited[cells] = True
+            pred[cells] = TELEPORT
+            reached.append(cells)
+
+        frontier = np.concatenate(reached)
+        dist[frontier] = wave
+
+    return dist.reshape(height, width), pred.reshape(height, width)
+
+
+def path_to(maze, dist, pred, target):
+    """Rebuild the path to target from wavefront() output.
+
+    Same shape as the solvers' paths: every cell after the source, ending
+    at target. Returns None if target wasn't reached.
+    """
+    r, c = target
+    if dist[r, c] < 0:
+        return None
+
+    cells = []
+    while pred[r, c] != NO_PREDECESSOR:
+        cells.append((r, c))
+        action = pred[r, c]
+        if action == UP:
+            r += 1
+        elif action == DOWN:
+            r -= 1
+        elif action == LEFT:
+            c += 1
+        elif action == RIGHT:
+            c -= 1
+        else:
+            r, c = maze.teleports[(r, c)]
+    cells.reverse()
+    return cells